@@ -5,12 +5,14 @@
 
 #include "maco_firmware/apps/factory/factory_test_service.h"
 
+#include <algorithm>
 #include <chrono>
 #include <iterator>
 
 #include "lvgl.h"
 #include "pw_chrono/system_clock.h"
 #include "pw_log/log.h"
+#include "pw_span/span.h"
 #include "pw_string/string_builder.h"
 #include "pw_thread/sleep.h"
 
@@ -27,6 +29,29 @@ void SetError(maco_factory_TestResponse& response, const char* msg) {
   pw::StringBuilder(response.message) << msg;
 }
 
+// Fills the active screen with a solid color. Returns false if there is no
+// active screen.
+bool FillScreen(uint32_t hex) {
+  lv_obj_t* screen = lv_screen_active();
+  if (screen == nullptr) {
+    return false;
+  }
+  lv_obj_set_style_bg_color(screen, lv_color_hex(hex), LV_PART_MAIN);
+  lv_obj_set_style_bg_opa(screen, LV_OPA_COVER, LV_PART_MAIN);
+  lv_obj_invalidate(screen);
+  return true;
+}
+
+constexpr uint32_t kSequenceRgbwcmy[] = {
+    0xFF0000, 0x00FF00, 0x0000FF, 0xFFFFFF, 0x00FFFF, 0xFF00FF, 0xFFFF00,
+};
+constexpr uint32_t kSequenceRgb[] = {0xFF0000, 0x00FF00, 0x0000FF};
+constexpr uint32_t kSequenceGrayscale[] = {
+    0x000000, 0x242424, 0x494949, 0x6D6D6D,
+    0x929292, 0xB6B6B6, 0xDBDBDB, 0xFFFFFF,
+};
+constexpr uint32_t kMaxSequenceDwellMs = 5000;
+
 }  // namespace
 
 pw::Status FactoryTestService::LedSetAll(
@@ -63,6 +88,29 @@ pw::Status FactoryTestService::LedSetPixel(
   return pw::OkStatus();
 }
 
+pw::Status FactoryTestService::LedSetPixels(
+    const ::maco_factory_LedPixelsRequest& request,
+    ::maco_factory_TestResponse& response) {
+  for (pb_size_t i = 0; i < request.pixels_count; ++i) {
+    if (request.pixels[i].index >= led_ops_.led_count) {
+      SetError(response, "Index out of range");
+      return pw::OkStatus();
+    }
+  }
+  for (pb_size_t i = 0; i < request.pixels_count; ++i) {
+    const auto& pixel = request.pixels[i];
+    led_ops_.set_pixel(static_cast<uint16_t>(pixel.index),
+                       static_cast<uint8_t>(pixel.r),
+                       static_cast<uint8_t>(pixel.g),
+                       static_cast<uint8_t>(pixel.b),
+                       static_cast<uint8_t>(pixel.w));
+  }
+  PW_LOG_INFO("LED SetPixels: %d pixels",
+              static_cast<int>(request.pixels_count));
+  SetOk(response);
+  return pw::OkStatus();
+}
+
 pw::Status FactoryTestService::LedClear(
     const ::maco_factory_Empty& /*request*/,
     ::maco_factory_TestResponse& response) {
@@ -83,17 +131,12 @@ pw::Status FactoryTestService::DisplaySetBrightness(
 pw::Status FactoryTestService::DisplayFillColor(
     const ::maco_factory_DisplayColorRequest& request,
     ::maco_factory_TestResponse& response) {
-  lv_obj_t* screen = lv_screen_active();
-  if (screen == nullptr) {
+  uint32_t hex = (request.r << 16) | (request.g << 8) | request.b;
+  if (!FillScreen(hex)) {
     SetError(response, "No active screen");
     return pw::OkStatus();
   }
 
-  uint32_t hex = (request.r << 16) | (request.g << 8) | request.b;
-  lv_obj_set_style_bg_color(screen, lv_color_hex(hex), LV_PART_MAIN);
-  lv_obj_set_style_bg_opa(screen, LV_OPA_COVER, LV_PART_MAIN);
-  lv_obj_invalidate(screen);
-
   PW_LOG_INFO("Display fill: #%06x", static_cast<unsigned>(hex));
   SetOk(response);
   return pw::OkStatus();
@@ -142,6 +185,45 @@ pw::Status FactoryTestService::DisplayColorBars(
   return pw::OkStatus();
 }
 
+pw::Status FactoryTestService::DisplayTestSequence(
+    const ::maco_factory_DisplayTestSequenceRequest& request,
+    ::maco_factory_TestResponse& response) {
+  pw::span<const uint32_t> colors;
+  switch (request.pattern) {
+    case maco_factory_DisplayTestSequenceRequest_Pattern_RGBWCMY:
+      colors = kSequenceRgbwcmy;
+      break;
+    case maco_factory_DisplayTestSequenceRequest_Pattern_RGB_ONLY:
+      colors = kSequenceRgb;
+      break;
+    case maco_factory_DisplayTestSequenceRequest_Pattern_GRAYSCALE_RAMP:
+      colors = kSequenceGrayscale;
+      break;
+    default:
+      SetError(response, "Unknown pattern");
+      return pw::OkStatus();
+  }
+
+  const auto dwell = std::chrono::milliseconds(
+      std::min(request.dwell_ms, kMaxSequenceDwellMs));
+  for (size_t i = 0; i < colors.size(); ++i) {
+    if (!FillScreen(colors[i])) {
+      SetError(response, "No active screen");
+      return pw::OkStatus();
+    }
+    // Leave the last color up; no need to hold the RPC for it.
+    if (i + 1 < colors.size()) {
+      pw::this_thread::sleep_for(dwell);
+    }
+  }
+
+  PW_LOG_INFO("Display test sequence: pattern=%d, %d colors",
+              static_cast<int>(request.pattern),
+              static_cast<int>(colors.size()));
+  SetOk(response);
+  return pw::OkStatus();
+}
+
 pw::Status FactoryTestService::BuzzerBeep(
     const ::maco_factory_BuzzerBeepRequest& request,
     ::maco_factory_TestResponse& response) {
@@ -41,6 +41,9 @@ class FactoryTestService final
   pw::Status LedSetPixel(const ::maco_factory_LedPixelRequest& request,
                          ::maco_factory_TestResponse& response);
 
+  pw::Status LedSetPixels(const ::maco_factory_LedPixelsRequest& request,
+                          ::maco_factory_TestResponse& response);
+
   pw::Status LedClear(const ::maco_factory_Empty& request,
                       ::maco_factory_TestResponse& response);
 
@@ -55,6 +58,10 @@ class FactoryTestService final
   pw::Status DisplayColorBars(const ::maco_factory_Empty& request,
                               ::maco_factory_TestResponse& response);
 
+  pw::Status DisplayTestSequence(
+      const ::maco_factory_DisplayTestSequenceRequest& request,
+      ::maco_factory_TestResponse& response);
+
   pw::Status BuzzerBeep(const ::maco_factory_BuzzerBeepRequest& request,
                         ::maco_factory_TestResponse& response);
 
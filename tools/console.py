@@ -53,7 +53,7 @@ from pw_system_protos import device_service_pb2
 from pw_unit_test_proto import unit_test_pb2
 
 
-_LOG = logging.getLogger(__file__)
+_LOG = logging.getLogger(__name__)
 
 
 def _get_project_root() -> Path:
@@ -12,8 +12,10 @@ Usage:
 """
 
 import argparse
+import functools
 import logging
 import os
+import socket
 import subprocess
 import sys
 import time
@@ -45,11 +47,15 @@ from pw_system_protos import device_service_pb2
 from pw_unit_test_proto import unit_test_pb2
 
 
-_LOG = logging.getLogger(__file__)
+_LOG = logging.getLogger(__name__)
 
 # Default socket address for simulator (matches pw_system defaults)
 DEFAULT_SOCKET_ADDR = "localhost:33000"
 
+# How often the detokenizer may stat() the token databases to pick up a
+# rebuild from device.update(). It only checks when decoding a token.
+_TOKEN_DB_POLL_PERIOD_S = 1.0
+
 # Diversification parameters — match functions/.env.local
 _MASTER_KEY = bytes.fromhex("c025f541727ecd8b6eb92055c88a2a70")
 _SYSTEM_NAME = "OwwMachineAuth"
@@ -123,6 +129,7 @@ TAG_PRESETS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def _get_project_root() -> Path:
     """Get project root from MACO_PROJECT_ROOT environment variable."""
     root = os.environ.get("MACO_PROJECT_ROOT")
@@ -140,6 +147,12 @@ def _get_project_root() -> Path:
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _build_env() -> dict[str, str]:
+    """Environment for build commands, computed once per process."""
+    return {**os.environ, "BAZELISK_SKIP_WRAPPER": "1"}
+
+
 def _run_cmd(cmd: list[str]) -> subprocess.CompletedProcess:
     """Run a command with output captured to avoid corrupting the TUI.
 
@@ -149,15 +162,11 @@ def _run_cmd(cmd: list[str]) -> subprocess.CompletedProcess:
     Returns:
         CompletedProcess with captured stdout/stderr.
     """
-    project_root = _get_project_root()
-    env = os.environ.copy()
-    env["BAZELISK_SKIP_WRAPPER"] = "1"
-
     _LOG.info("Running: %s", " ".join(cmd))
     result = subprocess.run(
         cmd,
-        cwd=project_root,
-        env=env,
+        cwd=_get_project_root(),
+        env=_build_env(),
         capture_output=True,
         text=True,
     )
@@ -173,8 +182,15 @@ def _run_cmd(cmd: list[str]) -> subprocess.CompletedProcess:
 class SimulatorProcess:
     """Manages the simulator subprocess."""
 
-    def __init__(self, binary_path: Path):
+    def __init__(
+        self,
+        binary_path: Path,
+        socket_addr: str = DEFAULT_SOCKET_ADDR,
+        startup_timeout_s: float = 10.0,
+    ):
         self.binary_path = binary_path
+        self.socket_addr = socket_addr
+        self.startup_timeout_s = startup_timeout_s
         self.process: subprocess.Popen | None = None
 
     def start(self) -> None:
@@ -182,14 +198,44 @@ class SimulatorProcess:
         if self.process is not None:
             self.stop()
         _LOG.info("Starting simulator: %s", self.binary_path)
+        # close_fds=False (and no cwd/preexec_fn) lets subprocess use
+        # posix_spawn instead of fork+exec, which avoids copying the page
+        # tables of the (large) console process on every hot restart.
+        # Python-created fds are non-inheritable, so nothing leaks.
         self.process = subprocess.Popen(
-            [str(self.binary_path)],
+            [str(self.binary_path.absolute())],
             stdin=subprocess.DEVNULL,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.STDOUT,  # Show errors
+            close_fds=False,
+        )
+        self._wait_until_listening()
+
+    def _wait_until_listening(self) -> None:
+        """Block until the simulator accepts connections on its socket.
+
+        Polls with exponential backoff instead of sleeping a fixed amount,
+        so a fast start is picked up within a few tens of milliseconds.
+        Gives up after startup_timeout_s (or if the process
+        exits); the connection retry loop reports the actual error.
+        """
+        host, _, port = self.socket_addr.rpartition(":")
+        address = (host or "localhost", int(port))
+        deadline = time.monotonic() + self.startup_timeout_s
+        delay = 0.01
+        while time.monotonic() < deadline:
+            if not self.is_running():
+                _LOG.error("Simulator exited during startup")
+                return
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(address) == 0:
+                    return
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        _LOG.warning(
+            "Simulator not listening on %s after %.1fs",
+            self.socket_addr, self.startup_timeout_s,
         )
-        # Let simulator initialize and start listening on socket
-        time.sleep(1.0)
 
     def stop(self) -> None:
         """Stop the simulator process."""
@@ -318,7 +364,8 @@ def create_sim_connection(
         for token_database in token_databases:
             token_databases_with_domains.append(str(token_database) + "#.*")
         detokenizer = detokenize.AutoUpdatingDetokenizer(
-            *token_databases_with_domains
+            *token_databases_with_domains,
+            min_poll_period_s=_TOKEN_DB_POLL_PERIOD_S,
         )
         detokenizer.show_errors = True
 
@@ -432,7 +479,7 @@ def main() -> int:
             i += 1
 
     # Start simulator
-    simulator = SimulatorProcess(args.sim_binary)
+    simulator = SimulatorProcess(args.sim_binary, socket_addr)
     simulator.start()
 
     print("🖥️  Simulator started, connecting console...")
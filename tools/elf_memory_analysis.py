@@ -4,6 +4,9 @@
 Dumps section VMAs (runtime addresses), LMAs (flash storage addresses),
 and sizes to help diagnose Bus Fault crashes during module_user_pre_init().
 
+The ELF is parsed in-process with pyelftools when it is installed; otherwise
+the tool falls back to running objdump (--objdump is then required).
+
 Usage:
     python3 tools/elf_memory_analysis.py --objdump <path> --elf <path>
     python3 tools/elf_memory_analysis.py --objdump <path> --elf1 <good> --elf2 <bad>
@@ -11,12 +14,22 @@ Usage:
 
 import subprocess
 import argparse
+import contextlib
+import io
 import sys
 import json
 from dataclasses import dataclass
 
+try:
+    from elftools.elf.constants import SH_FLAGS
+    from elftools.elf.elffile import ELFFile
+
+    _HAVE_ELFTOOLS = True
+except ImportError:
+    _HAVE_ELFTOOLS = False
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Section:
     name: str
     size: int
@@ -26,7 +39,7 @@ class Section:
     align: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Symbol:
     name: str
     address: int
@@ -47,21 +60,22 @@ SYSTEM_PART1_END = 0x081E0000  # system part 1 = 1536K from 0x08060000
 
 def get_sections(objdump: str, elf: str) -> list[Section]:
     """Extract all sections from ELF."""
+    # objdump output is plain ASCII; keep it as bytes to skip decoding.
     result = subprocess.run(
-        [objdump, "-h", elf], capture_output=True, text=True
+        [objdump, "-h", elf], capture_output=True, text=False, check=False
     )
     sections = []
-    for line in result.stdout.split('\n'):
+    for line in result.stdout.splitlines():
         parts = line.split()
         if len(parts) >= 7 and parts[0].isdigit():
             try:
                 sections.append(Section(
-                    name=parts[1],
+                    name=parts[1].decode("ascii", "replace"),
                     size=int(parts[2], 16),
                     vma=int(parts[3], 16),
                     lma=int(parts[4], 16),
                     file_off=int(parts[5], 16),
-                    align=int(parts[6].replace("2**", "")) if "2**" in parts[6] else 0,
+                    align=int(parts[6].replace(b"2**", b"")) if b"2**" in parts[6] else 0,
                 ))
             except (ValueError, IndexError):
                 continue
@@ -71,24 +85,91 @@ def get_sections(objdump: str, elf: str) -> list[Section]:
 def get_symbols(objdump: str, elf: str, names: list[str]) -> dict[str, Symbol]:
     """Extract specific symbols from ELF."""
     result = subprocess.run(
-        [objdump, "-t", elf], capture_output=True, text=True
+        [objdump, "-t", elf], capture_output=True, text=False, check=False
     )
+    encoded_names = [(name, name.encode("ascii")) for name in names]
     symbols = {}
-    for line in result.stdout.split('\n'):
-        for name in names:
-            if name in line and not line.startswith("SYMBOL"):
+    for line in result.stdout.splitlines():
+        if line.startswith(b"SYMBOL"):
+            continue
+        for name, encoded in encoded_names:
+            if encoded in line:
                 parts = line.split()
                 if len(parts) >= 2:
                     try:
                         addr = int(parts[0], 16)
                         # Find section name (usually field 3)
-                        sect = parts[3] if len(parts) > 3 else "?"
+                        sect = parts[3].decode("ascii", "replace") if len(parts) > 3 else "?"
                         symbols[name] = Symbol(name=name, address=addr, section=sect)
                     except (ValueError, IndexError):
                         continue
     return symbols
 
 
+# Section types objdump -h does not list unless they are allocated.
+_BOOKKEEPING_SECTION_TYPES = frozenset(
+    {"SHT_NULL", "SHT_SYMTAB", "SHT_STRTAB", "SHT_REL", "SHT_RELA"}
+)
+
+
+def read_elf(elf: str, names: list[str]) -> tuple[list[Section], dict[str, Symbol]]:
+    """Extract sections and specific symbols by parsing the ELF in-process.
+
+    Equivalent to get_sections() + get_symbols(), but reads the file once
+    with pyelftools instead of spawning objdump twice.
+    """
+    wanted = set(names)
+    with open(elf, "rb") as f:
+        elf_file = ELFFile(f)
+        load_segments = [
+            seg for seg in elf_file.iter_segments() if seg["p_type"] == "PT_LOAD"
+        ]
+
+        sections = []
+        section_names = []
+        for sec in elf_file.iter_sections():
+            section_names.append(sec.name)
+            allocated = bool(sec["sh_flags"] & SH_FLAGS.SHF_ALLOC)
+            if sec["sh_type"] in _BOOKKEEPING_SECTION_TYPES and not allocated:
+                continue
+            vma = sec["sh_addr"]
+            lma = vma
+            if allocated:
+                for seg in load_segments:
+                    if seg.section_in_segment(sec):
+                        lma = vma - seg["p_vaddr"] + seg["p_paddr"]
+                        break
+            addralign = sec["sh_addralign"]
+            sections.append(Section(
+                name=sec.name,
+                size=sec["sh_size"],
+                vma=vma,
+                lma=lma,
+                file_off=sec["sh_offset"],
+                align=addralign.bit_length() - 1 if addralign else 0,
+            ))
+
+        symbols = {}
+        symtab = elf_file.get_section_by_name(".symtab")
+        if symtab is not None:
+            for sym in symtab.iter_symbols():
+                if sym.name not in wanted:
+                    continue
+                shndx = sym["st_shndx"]
+                if shndx == "SHN_ABS":
+                    sect = "*ABS*"
+                elif shndx == "SHN_UNDEF":
+                    sect = "*UND*"
+                elif isinstance(shndx, int) and shndx < len(section_names):
+                    sect = section_names[shndx]
+                else:
+                    sect = "?"
+                symbols[sym.name] = Symbol(
+                    name=sym.name, address=sym["st_value"], section=sect
+                )
+    return sections, symbols
+
+
 def region_name(addr: int) -> str:
     """Identify which memory region an address belongs to."""
     if PSRAM_START <= addr < PSRAM_END:
@@ -103,15 +184,55 @@ def region_name(addr: int) -> str:
         return f"INVALID(0x{addr:08X})"
 
 
+def region_usage(sections: list[Section]) -> dict[str, tuple[int, int, int]]:
+    """Aggregate non-empty sections per memory region in a single pass.
+
+    Returns:
+        Dict mapping "PSRAM"/"SRAM"/"FLASH" to (total size, lowest VMA,
+        highest end VMA). Regions without sections are omitted.
+    """
+    usage: dict[str, tuple[int, int, int]] = {}
+    for s in sections:
+        if s.size <= 0:
+            continue
+        if PSRAM_START <= s.vma < PSRAM_END:
+            region = "PSRAM"
+        elif SRAM_START <= s.vma < SRAM_END:
+            region = "SRAM"
+        elif FLASH_START <= s.vma < FLASH_END:
+            region = "FLASH"
+        else:
+            continue
+        end = s.vma + s.size
+        if region in usage:
+            total, lo, hi = usage[region]
+            usage[region] = (total + s.size, min(lo, s.vma), max(hi, end))
+        else:
+            usage[region] = (s.size, s.vma, end)
+    return usage
+
+
 def analyze_elf(objdump: str, elf: str, label: str = ""):
-    """Full analysis of one ELF file."""
+    """Full analysis of one ELF file.
+
+    The report is built in memory and written to stdout in one go instead
+    of issuing a separate (line-buffered) write per print().
+    """
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            return _analyze_elf(objdump, elf, label)
+    finally:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+
+
+def _analyze_elf(objdump: str, elf: str, label: str):
     if label:
         print(f"\n{'='*70}")
         print(f"  {label}")
         print(f"{'='*70}")
 
-    sections = get_sections(objdump, elf)
-
     # Key linker symbols used by module_user_pre_init()
     key_symbols = [
         "link_global_data_initial_values",  # .data source (flash LMA)
@@ -134,7 +255,11 @@ def analyze_elf(objdump: str, elf: str, label: str = ""):
         "platform_user_part_psram_start",
         "platform_user_part_static_ram_start",
     ]
-    symbols = get_symbols(objdump, elf, key_symbols)
+    if _HAVE_ELFTOOLS:
+        sections, symbols = read_elf(elf, key_symbols)
+    else:
+        sections = get_sections(objdump, elf)
+        symbols = get_symbols(objdump, elf, key_symbols)
 
     # Section table
     print(f"\n--- Sections ---")
@@ -145,33 +270,25 @@ def analyze_elf(objdump: str, elf: str, label: str = ""):
             print(f"{s.name:<25} {s.size:>10,} {s.vma:>#12x} {s.lma:>#12x} {region_name(s.vma):<10} {region_name(s.lma):<10}")
 
     # Memory usage summary
-    psram_sections = [s for s in sections if PSRAM_START <= s.vma < PSRAM_END and s.size > 0]
-    sram_sections = [s for s in sections if SRAM_START <= s.vma < SRAM_END and s.size > 0]
-    flash_sections = [s for s in sections if FLASH_START <= s.vma < FLASH_END and s.size > 0]
+    usage = region_usage(sections)
 
     print(f"\n--- Memory Usage ---")
-    if psram_sections:
-        psram_min = min(s.vma for s in psram_sections)
-        psram_max = max(s.vma + s.size for s in psram_sections)
-        psram_total = sum(s.size for s in psram_sections)
+    if "PSRAM" in usage:
+        psram_total, psram_min, psram_max = usage["PSRAM"]
         print(f"PSRAM:  {psram_total:>10,} bytes  range: 0x{psram_min:08X} - 0x{psram_max:08X}  ({psram_max - psram_min:,} span)")
         print(f"        Available: 0x{PSRAM_START:08X} - 0x{PSRAM_END:08X} (4MB)")
         if psram_min < PSRAM_START or psram_max > PSRAM_END:
             print(f"  *** PSRAM OUT OF BOUNDS! ***")
 
-    if sram_sections:
-        sram_min = min(s.vma for s in sram_sections)
-        sram_max = max(s.vma + s.size for s in sram_sections)
-        sram_total = sum(s.size for s in sram_sections)
+    if "SRAM" in usage:
+        sram_total, sram_min, sram_max = usage["SRAM"]
         print(f"SRAM:   {sram_total:>10,} bytes  range: 0x{sram_min:08X} - 0x{sram_max:08X}  ({sram_max - sram_min:,} span)")
         print(f"        Available: 0x{SRAM_START:08X} - 0x{SRAM_USER_END:08X} (464KB for user)")
         if sram_min < SRAM_START or sram_max > SRAM_USER_END:
             print(f"  *** SRAM OUT OF BOUNDS! ***")
 
-    if flash_sections:
-        flash_min = min(s.vma for s in flash_sections)
-        flash_max = max(s.vma + s.size for s in flash_sections)
-        flash_total = sum(s.size for s in flash_sections)
+    if "FLASH" in usage:
+        flash_total, flash_min, flash_max = usage["FLASH"]
         print(f"FLASH:  {flash_total:>10,} bytes  range: 0x{flash_min:08X} - 0x{flash_max:08X}  ({flash_max - flash_min:,} span)")
         if flash_min < SYSTEM_PART1_END:
             print(f"  *** FLASH OVERLAPS SYSTEM PART 1! ***")
@@ -270,11 +387,15 @@ def main():
     parser = argparse.ArgumentParser(
         description="Analyze P2 firmware ELF memory layout"
     )
-    parser.add_argument("--objdump", required=True, help="Path to objdump")
+    parser.add_argument(
+        "--objdump", help="Path to objdump (only used without pyelftools)"
+    )
     parser.add_argument("--elf", help="Single ELF to analyze")
     parser.add_argument("--elf1", help="First ELF (good/non-crashing)")
     parser.add_argument("--elf2", help="Second ELF (bad/crashing)")
     args = parser.parse_args()
+    if not _HAVE_ELFTOOLS and not args.objdump:
+        parser.error("--objdump is required when pyelftools is not installed")
 
     if args.elf:
         analyze_elf(args.objdump, args.elf, label=args.elf)
@@ -5,7 +5,7 @@
 
 Extends the standard console with factory-specific commands:
 - LED tests (set color, individual pixels, clear)
-- Display tests (fill color, color bars, brightness)
+- Display tests (fill color, color bars, color sequences, brightness)
 - Device secrets provisioning (provision, check, clear)
 
 Usage:
@@ -14,9 +14,15 @@ Usage:
 """
 
 import argparse
+import binascii
+import collections
+import functools
 import glob
 import logging
+import logging.handlers
 import os
+import queue
+import re
 import sys
 import time
 from pathlib import Path
@@ -34,6 +40,7 @@ from pw_console.log_store import LogStore
 from pw_hdlc import rpc
 from pw_log.log_decoder import timestamp_parser_ms_since_boot
 from pw_stream import stream_readers
+from pw_tokenizer import database as token_database_lib
 from pw_tokenizer import detokenize
 from pw_system.device import Device as PwSystemDevice
 from pw_system.device_connection import (
@@ -42,6 +49,13 @@ from pw_system.device_connection import (
 )
 from pw_rpc.console_tools.console import flattened_rpc_completions
 
+try:
+    import inotify_simple
+
+    _HAVE_INOTIFY = True
+except ImportError:
+    _HAVE_INOTIFY = False
+
 from maco_pb import maco_service_pb2
 from maco_pb import factory_test_service_pb2
 from maco_pb import device_secrets_service_pb2
@@ -57,7 +71,11 @@ from pw_system_protos import device_service_pb2
 from pw_unit_test_proto import unit_test_pb2
 
 
-_LOG = logging.getLogger(__file__)
+_LOG = logging.getLogger(__name__)
+
+# Chunk size for the RPC reader. A multiple of both the page size and the
+# USB packet sizes (64/512 B), so one read can take a whole burst.
+_READ_CHUNK_SIZE = int(os.environ.get("MACO_SERIAL_READ_BUF", 65536))
 
 
 class ReconnectingSerialClient:
@@ -81,6 +99,8 @@ class ReconnectingSerialClient:
         self._serial_debug = serial_debug
         self._serial: serial.Serial | None = None
         self._connected = False
+        # Bytes read from the port but not yet returned by read().
+        self._read_buffer = bytearray()
         self.connect()
 
     def connect(self) -> None:
@@ -100,7 +120,15 @@ class ReconnectingSerialClient:
         self._serial = serial_impl(
             device, self._baudrate, timeout=self._timeout,
         )
+        # USB serial adapters default to a ~16 ms latency timer, which is
+        # added to every RPC round trip. pyserial sets ASYNC_LOW_LATENCY via
+        # TIOCSSERIAL on Linux; other platforms/drivers just don't support it.
+        try:
+            self._serial.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+            _LOG.debug("Low-latency mode unavailable on %s: %s", device, e)
         self._device = device
+        self._read_buffer.clear()
         self._connected = True
         _LOG.info("Connected to %s", device)
 
@@ -115,11 +143,27 @@ class ReconnectingSerialClient:
             return self._serial.write(data) if self._serial else None
 
     def read(self, num_bytes: int = DEFAULT_MAX_READ_SIZE) -> bytes:
+        """Read up to num_bytes, refilling an internal buffer in bursts.
+
+        Small reads are served from the buffer; a refill pulls everything
+        the driver has queued in one call, without waiting for num_bytes to
+        arrive. The reader calls this with its chunk size (larger than the
+        tty queue), so no bytes are left in the buffer while select() on
+        fileno() reports the port as idle.
+        """
         if not self._connected or self._serial is None:
             raise Exception("Serial is not connected.")
         try:
-            data = self._serial.read(num_bytes)
-            return data if data else b""
+            if not self._read_buffer:
+                data = self._serial.read(self._serial.in_waiting or num_bytes)
+                if not data:
+                    return b""
+                if len(data) <= num_bytes:
+                    return data
+                self._read_buffer += data
+            data = bytes(self._read_buffer[:num_bytes])
+            del self._read_buffer[:num_bytes]
+            return data
         except (OSError, serial.SerialException) as e:
             _LOG.error("Read error: %s", e)
             self._handle_disconnect()
@@ -151,19 +195,65 @@ class ReconnectingSerialClient:
         self._connected = False
 
 
-def wait_for_device(device_path: str, timeout: float = 30.0) -> bool:
-    """Wait for device to appear at the given path."""
-    start = time.time()
-    while time.time() - start < timeout:
-        if '*' in device_path:
-            matches = glob.glob(device_path)
-            if matches:
-                return True
-        elif os.path.exists(device_path):
-            return True
+def _find_device(device_path: str) -> str | None:
+    """Return the path matching device_path (may be a glob), if present."""
+    if '*' in device_path:
+        matches = glob.glob(device_path)
+        return matches[0] if matches else None
+    return device_path if os.path.exists(device_path) else None
+
+
+def _wait_for_device_inotify(device_path: str, timeout: float) -> str | None:
+    """Block on inotify events in the device directory until a match."""
+    directory = os.path.dirname(device_path) or "."
+    deadline = time.monotonic() + timeout
+    with inotify_simple.INotify() as inotify:
+        inotify.add_watch(
+            directory,
+            inotify_simple.flags.CREATE | inotify_simple.flags.MOVED_TO,
+        )
+        # Check after adding the watch so an appearance in between is not
+        # missed.
+        while (found := _find_device(device_path)) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            inotify.read(timeout=int(remaining * 1000) + 1)
+    return found
+
+
+def wait_for_device(device_path: str, timeout: float = 30.0) -> str | None:
+    """Wait for device to appear at the given path.
+
+    Reacts to the udev node being created via inotify when inotify_simple
+    is installed; falls back to polling every 0.5 s otherwise.
+
+    Returns:
+        The matched device path (the first match for a glob pattern), or
+        None on timeout.
+    """
+    if _HAVE_INOTIFY:
+        try:
+            return _wait_for_device_inotify(device_path, timeout)
+        except OSError as e:
+            _LOG.debug("inotify unavailable, polling instead: %s", e)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        found = _find_device(device_path)
+        if found is not None:
+            return found
         time.sleep(0.5)
-    return False
+    return None
+
+
+# Matches a 16-byte key written as 32 hex characters.
+_is_hex_key = re.compile(r"[0-9a-fA-F]{32}").fullmatch
+
+# How long check_secrets()/get_device_info() results are reused.
+_RPC_CACHE_TTL_S = 0.5
 
+# Max number of unanswered LED RPCs in flight during led_test().
+_LED_PIPELINE_DEPTH = 4
 
 # Named color presets
 LED_COLORS = {
@@ -177,6 +267,20 @@ LED_COLORS = {
     "off": (0, 0, 0, 0),
 }
 
+_SequenceRequest = factory_test_service_pb2.DisplayTestSequenceRequest
+
+# display_test_sequence() patterns: name -> (proto enum, number of colors)
+_DISPLAY_SEQUENCES = {
+    "rgbwcmy": (_SequenceRequest.RGBWCMY, 7),
+    "rgb": (_SequenceRequest.RGB_ONLY, 3),
+    "grayscale": (_SequenceRequest.GRAYSCALE_RAMP, 8),
+}
+# Firmware caps the per-color dwell (kMaxSequenceDwellMs).
+_MAX_SEQUENCE_DWELL_MS = 5000
+
+# RGBW values for the full-strip phase of led_test(), resolved once.
+_LED_TEST_COLORS = [LED_COLORS[c] for c in ("red", "green", "blue", "white")]
+
 
 class FactoryDevice(PwSystemDevice):
     """Factory device with hardware test and provisioning commands."""
@@ -184,13 +288,66 @@ class FactoryDevice(PwSystemDevice):
     def __init__(self, serial_suffix: str | None = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._serial_suffix = serial_suffix
+        # Request messages reused across calls. pw_rpc encodes the request
+        # when the call is sent, so refilling them afterwards is safe even
+        # with calls still in flight.
+        self._led_color_req = factory_test_service_pb2.LedColorRequest()
+        self._led_pixel_req = factory_test_service_pb2.LedPixelRequest()
+        self._display_color_req = factory_test_service_pb2.DisplayColorRequest()
+        # key -> (monotonic timestamp, value) for _cached()
+        self._rpc_cache: dict[str, tuple[float, object]] = {}
 
     @property
     def serial_suffix(self) -> str | None:
         return self._serial_suffix
 
+    def _cached(self, key: str, fetch: Callable[[], object]):
+        """Return fetch()'s value, reusing it for _RPC_CACHE_TTL_S.
+
+        Coalesces back-to-back reads (e.g. check_secrets() right around a
+        provisioning step, or a UI polling get_device_info()).
+        """
+        now = time.monotonic()
+        hit = self._rpc_cache.get(key)
+        if hit is not None and now - hit[0] < _RPC_CACHE_TTL_S:
+            return hit[1]
+        value = fetch()
+        self._rpc_cache[key] = (now, value)
+        return value
+
+    def _led_color_request(self, r: int, g: int, b: int, w: int):
+        req = self._led_color_req
+        req.Clear()
+        req.r, req.g, req.b, req.w = r, g, b, w
+        return req
+
+    def _led_pixel_request(self, index: int, r: int, g: int, b: int, w: int):
+        req = self._led_pixel_req
+        req.Clear()
+        req.index, req.r, req.g, req.b, req.w = index, r, g, b, w
+        return req
+
+    # RPC service clients, resolved once instead of walking the rpcs
+    # attribute chain on every call.
+
+    @functools.cached_property
+    def _maco_service(self):
+        return self.rpcs.maco.MacoService
+
+    @functools.cached_property
+    def _factory_service(self):
+        return self.rpcs.maco.factory.FactoryTestService
+
+    @functools.cached_property
+    def _secrets_service(self):
+        return self.rpcs.maco.secrets.DeviceSecretsService
+
     # ── LED Tests ──────────────────────────────────────────────────────
 
+    # Routine command results go to the Host Logs pane via _LOG; print()
+    # is kept for input errors and provisioning results, which the
+    # operator must see in the REPL.
+
     def led_all(self, color: str = "red"):
         """Set all LEDs to a named color.
 
@@ -199,67 +356,103 @@ class FactoryDevice(PwSystemDevice):
         if color not in LED_COLORS:
             print(f"Unknown color '{color}'. Available: {', '.join(LED_COLORS)}")
             return
-        r, g, b, w = LED_COLORS[color]
-        resp = self.rpcs.maco.factory.FactoryTestService.LedSetAll(
-            r=r, g=g, b=b, w=w
+        resp = self._factory_service.LedSetAll(
+            self._led_color_request(*LED_COLORS[color])
         )
-        print(f"LED all -> {color}: {resp.response.message}")
+        _LOG.info("LED all -> %s: %s", color, resp.response.message)
 
     def led_rgb(self, r: int = 0, g: int = 0, b: int = 0, w: int = 0):
         """Set all LEDs to specific RGBW values (0-255)."""
-        resp = self.rpcs.maco.factory.FactoryTestService.LedSetAll(
-            r=r, g=g, b=b, w=w
+        resp = self._factory_service.LedSetAll(
+            self._led_color_request(r, g, b, w)
         )
-        print(f"LED all -> ({r},{g},{b},{w}): {resp.response.message}")
+        _LOG.info("LED all -> (%d,%d,%d,%d): %s", r, g, b, w, resp.response.message)
 
     def led_pixel(self, index: int, r: int = 0, g: int = 0, b: int = 0, w: int = 0):
         """Set a single LED pixel to RGBW values."""
-        resp = self.rpcs.maco.factory.FactoryTestService.LedSetPixel(
-            index=index, r=r, g=g, b=b, w=w
+        resp = self._factory_service.LedSetPixel(
+            self._led_pixel_request(index, r, g, b, w)
+        )
+        _LOG.info(
+            "LED [%d] -> (%d,%d,%d,%d): %s",
+            index, r, g, b, w, resp.response.message,
         )
-        print(f"LED [{index}] -> ({r},{g},{b},{w}): {resp.response.message}")
+
+    def led_pixels(self, updates: list[tuple[int, int, int, int, int]]):
+        """Set several LED pixels in a single RPC.
+
+        Args:
+            updates: (index, r, g, b, w) tuples, at most 16.
+        """
+        request = factory_test_service_pb2.LedPixelsRequest(
+            pixels=[
+                factory_test_service_pb2.LedPixelRequest(
+                    index=index, r=r, g=g, b=b, w=w
+                )
+                for index, r, g, b, w in updates
+            ]
+        )
+        resp = self._factory_service.LedSetPixels(request)
+        _LOG.info("LED %d pixels: %s", len(updates), resp.response.message)
 
     def led_clear(self):
         """Turn off all LEDs."""
-        resp = self.rpcs.maco.factory.FactoryTestService.LedClear()
-        print(f"LED clear: {resp.response.message}")
+        resp = self._factory_service.LedClear()
+        _LOG.info("LED clear: %s", resp.response.message)
 
     def led_test(self):
-        """Run LED test sequence: R, G, B, W, then pixel walk."""
-        import time as _time
+        """Run LED test sequence: R, G, B, W, then pixel walk.
+
+        RPCs are pipelined: each one is sent without waiting for the
+        previous response, so the serial round trip overlaps with the dwell
+        time instead of adding to it. At most _LED_PIPELINE_DEPTH calls are
+        outstanding at any time.
+        """
+        service = self._factory_service
+        pending: collections.deque = collections.deque()
+
+        def submit(method, request=None) -> None:
+            if len(pending) >= _LED_PIPELINE_DEPTH:
+                pending.popleft().wait()
+            pending.append(method.invoke(request))
 
-        for color in ["red", "green", "blue", "white"]:
-            self.led_all(color)
-            _time.sleep(1)
+        for r, g, b, w in _LED_TEST_COLORS:
+            submit(service.LedSetAll, self._led_color_request(r, g, b, w))
+            time.sleep(1)
 
-        self.led_clear()
-        _time.sleep(0.3)
+        submit(service.LedClear)
+        time.sleep(0.3)
 
         # Walk individual pixels
         for i in range(16):
-            self.led_pixel(i, w=128)
-            _time.sleep(0.15)
+            submit(service.LedSetPixel, self._led_pixel_request(i, 0, 0, 0, 128))
+            time.sleep(0.15)
 
-        _time.sleep(1)
-        self.led_clear()
-        print("LED test complete")
+        time.sleep(1)
+        submit(service.LedClear)
+
+        while pending:
+            pending.popleft().wait()
+        _LOG.info("LED test complete")
 
     # ── Display Tests ──────────────────────────────────────────────────
 
     def display_brightness(self, level: int):
         """Set display backlight brightness (0-255)."""
-        resp = self.rpcs.maco.factory.FactoryTestService.DisplaySetBrightness(
+        resp = self._factory_service.DisplaySetBrightness(
             brightness=level
         )
-        print(f"Brightness -> {level}: {resp.response.message}")
+        _LOG.info("Brightness -> %d: %s", level, resp.response.message)
 
     def display_fill(self, r: int = 255, g: int = 255, b: int = 255):
         """Fill display with a solid color (RGB 0-255)."""
-        resp = self.rpcs.maco.factory.FactoryTestService.DisplayFillColor(
-            r=r, g=g, b=b
+        req = self._display_color_req
+        req.Clear()
+        req.r, req.g, req.b = r, g, b
+        resp = self._factory_service.DisplayFillColor(req)
+        _LOG.info(
+            "Display fill #%02x%02x%02x: %s", r, g, b, resp.response.message
         )
-        color_hex = f"#{r:02x}{g:02x}{b:02x}"
-        print(f"Display fill {color_hex}: {resp.response.message}")
 
     def display_white(self):
         """Fill display with white."""
@@ -283,15 +476,37 @@ class FactoryDevice(PwSystemDevice):
 
     def display_color_bars(self):
         """Show color bar test pattern (R/G/B/W/C/M/Y)."""
-        resp = self.rpcs.maco.factory.FactoryTestService.DisplayColorBars()
-        print(f"Color bars: {resp.response.message}")
+        resp = self._factory_service.DisplayColorBars()
+        _LOG.info("Color bars: %s", resp.response.message)
+
+    def display_test_sequence(self, pattern: str = "rgbwcmy", dwell_ms: int = 1000):
+        """Cycle the display through a color sequence on the device.
+
+        Patterns: rgbwcmy, rgb, grayscale
+        """
+        if pattern not in _DISPLAY_SEQUENCES:
+            _LOG.error(
+                "Unknown pattern '%s'. Available: %s",
+                pattern, ", ".join(_DISPLAY_SEQUENCES),
+            )
+            return
+        pattern_value, steps = _DISPLAY_SEQUENCES[pattern]
+        # The device holds the RPC while it steps through the colors.
+        resp = self._factory_service.DisplayTestSequence(
+            pattern=pattern_value,
+            dwell_ms=dwell_ms,
+            pw_rpc_timeout_s=steps * min(dwell_ms, _MAX_SEQUENCE_DWELL_MS) / 1000 + 2,
+        )
+        _LOG.info("Display sequence %s: %s", pattern, resp.response.message)
 
     # ── Provisioning ───────────────────────────────────────────────────
 
     def check_secrets(self):
         """Check if device secrets are provisioned."""
-        resp = self.rpcs.maco.secrets.DeviceSecretsService.GetStatus()
-        provisioned = resp.response.is_provisioned
+        provisioned = self._cached(
+            "secrets_status",
+            lambda: self._secrets_service.GetStatus().response.is_provisioned,
+        )
         status = "PROVISIONED" if provisioned else "NOT PROVISIONED"
         print(f"Device secrets: {status}")
         return provisioned
@@ -303,21 +518,17 @@ class FactoryDevice(PwSystemDevice):
             gateway_secret: 16-byte gateway master secret as hex string (32 chars)
             ntag_key: 16-byte NTAG terminal key as hex string (32 chars)
         """
-        try:
-            gw_bytes = bytes.fromhex(gateway_secret)
-            ntag_bytes = bytes.fromhex(ntag_key)
-        except ValueError:
-            print("Error: secrets must be valid hex strings")
+        if not (_is_hex_key(gateway_secret) and _is_hex_key(ntag_key)):
+            print("Error: secrets must be 16 bytes as 32 hex chars")
             return
+        gw_bytes = binascii.unhexlify(gateway_secret)
+        ntag_bytes = binascii.unhexlify(ntag_key)
 
-        if len(gw_bytes) != 16 or len(ntag_bytes) != 16:
-            print("Error: secrets must be exactly 16 bytes (32 hex chars)")
-            return
-
-        resp = self.rpcs.maco.secrets.DeviceSecretsService.Provision(
+        resp = self._secrets_service.Provision(
             gateway_master_secret=gw_bytes,
             ntag_terminal_key=ntag_bytes,
         )
+        self._rpc_cache.pop("secrets_status", None)
         if resp.response.success:
             print("Secrets provisioned successfully")
         else:
@@ -325,7 +536,8 @@ class FactoryDevice(PwSystemDevice):
 
     def clear_secrets(self):
         """Clear all provisioned secrets. WARNING: Erases keys permanently."""
-        resp = self.rpcs.maco.secrets.DeviceSecretsService.Clear()
+        resp = self._secrets_service.Clear()
+        self._rpc_cache.pop("secrets_status", None)
         if resp.response.success:
             print("Secrets cleared")
         else:
@@ -335,13 +547,15 @@ class FactoryDevice(PwSystemDevice):
 
     def echo(self, data: bytes = b"hello") -> bytes:
         """Echo data back from the device."""
-        response = self.rpcs.maco.MacoService.Echo(data=data)
+        response = self._maco_service.Echo(data=data)
         return response.response.data
 
     def get_device_info(self):
         """Get device information."""
-        response = self.rpcs.maco.MacoService.GetDeviceInfo()
-        return response.response
+        return self._cached(
+            "device_info",
+            lambda: self._maco_service.GetDeviceInfo().response,
+        )
 
 
 def create_connection(
@@ -355,11 +569,12 @@ def create_connection(
     channel_id: int = rpc.DEFAULT_CHANNEL_ID,
     hdlc_encoding: bool = True,
     serial_suffix: str | None = None,
+    detokenize_auto_update: bool = False,
 ) -> DeviceConnection:
     """Create a device connection with auto-reconnect for serial devices."""
 
     detokenizer = None
-    if token_databases:
+    if token_databases and detokenize_auto_update:
         token_databases_with_domains = []
         for token_database in token_databases:
             token_databases_with_domains.append(str(token_database) + "#.*")
@@ -367,6 +582,15 @@ def create_connection(
             *token_databases_with_domains
         )
         detokenizer.show_errors = True
+    elif token_databases:
+        # The factory firmware doesn't change during a session: load the
+        # databases once instead of watching them for updates.
+        detokenizer = detokenize.Detokenizer(
+            token_database_lib.load_token_database(
+                *token_databases, domain=".*"
+            ),
+            show_errors=True,
+        )
 
     protos: list[ModuleType | Path] = []
     if compiled_protos is None:
@@ -390,20 +614,17 @@ def create_connection(
         def disconnect_handler(serial_client: ReconnectingSerialClient) -> None:
             _LOG.error("Serial disconnected. Waiting for device to reappear...")
             while True:
-                if wait_for_device(device_pattern, timeout=1.0):
-                    if "*" in device_pattern:
-                        matches = glob.glob(device_pattern)
-                        actual_device = matches[0] if matches else device
-                    else:
-                        actual_device = device
+                actual_device = wait_for_device(device_pattern, timeout=30.0)
+                if actual_device is not None:
                     try:
-                        time.sleep(0.5)
+                        # Let the tty settle after udev creates the node.
+                        time.sleep(0.2)
                         serial_client.connect_to(actual_device)
                         _LOG.info("Successfully reconnected to %s", actual_device)
                         break
                     except Exception as e:
                         _LOG.debug("Reconnect attempt failed: %s", e)
-                time.sleep(1)
+                        time.sleep(1)
 
         serial_client = ReconnectingSerialClient(
             device=device,
@@ -411,7 +632,7 @@ def create_connection(
             on_disconnect=disconnect_handler,
             serial_debug=serial_debug,
         )
-        reader = stream_readers.SelectableReader(serial_client, 8192)
+        reader = stream_readers.SelectableReader(serial_client, _READ_CHUNK_SIZE)
         write = serial_client.write
     else:
         socket_impl = (
@@ -435,7 +656,7 @@ def create_connection(
         socket_device = socket_impl(
             socket_addr, on_disconnect=socket_disconnect_handler
         )
-        reader = stream_readers.SelectableReader(socket_device, 8192)
+        reader = stream_readers.SelectableReader(socket_device, _READ_CHUNK_SIZE)
         write = socket_device.write
 
     device_client = FactoryDevice(
@@ -480,42 +701,64 @@ REPL examples:
 def main() -> int:
     from tools.factory_test_pane import FactoryTestPane
 
-    serial_suffix = None
-    filtered_argv = [sys.argv[0]]
-    i = 1
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--device-serial-suffix" and i + 1 < len(sys.argv):
-            serial_suffix = sys.argv[i + 1]
-            i += 2
-        elif arg.startswith("--device-serial-suffix="):
-            serial_suffix = arg.split("=", 1)[1]
-            i += 1
-        else:
-            filtered_argv.append(arg)
-            i += 1
-
     parser = argparse.ArgumentParser(
         prog="maco-factory-console",
         description=__doc__,
     )
     parser = add_device_args(parser)
-    args, _remaining_args = parser.parse_known_args(filtered_argv[1:])
+    parser.add_argument(
+        "--device-serial-suffix",
+        default=None,
+        help="Serial number suffix; reconnects to /dev/particle_*<suffix>",
+    )
+    parser.add_argument(
+        "--detokenize-auto-update",
+        action="store_true",
+        help="Reload token databases when they change on disk",
+    )
+    args, _remaining_args = parser.parse_known_args(sys.argv[1:])
+    serial_suffix = args.device_serial_suffix
 
     is_serial = args.device is not None
 
     if is_serial and not os.path.exists(args.device):
         print(f"Waiting for device {args.device}...")
-        if not wait_for_device(args.device):
+        if wait_for_device(args.device) is None:
             print(f"Device {args.device} not found")
             return 1
         print(f"Device {args.device} found")
         time.sleep(0.5)
 
+    log_listeners: list[logging.handlers.QueueListener] = []
     try:
         if serial_suffix:
             print(f"Connected to {args.device} (serial: ...{serial_suffix})")
 
+        # Set up log stores for pw_console log windows. Done before the
+        # connection exists so nothing here runs once the reader is live.
+        _DEVICE_LOG = logging.getLogger("pw_rpc_device")
+        _DEVICE_LOG.propagate = False
+        device_log_store = LogStore()
+        root_log_store = LogStore()
+        # Hand records to the log stores on listener threads, so the RPC
+        # and serial threads only enqueue and never wait on log-pane work.
+        for logger, store in (
+            (_DEVICE_LOG, device_log_store),
+            (logging.getLogger(), root_log_store),
+        ):
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            listener = logging.handlers.QueueListener(
+                log_queue, store, respect_handler_level=True
+            )
+            listener.start()
+            log_listeners.append(listener)
+
+        logfile = pw_logging.create_temp_log_file()
+        pw_cli.log.install(
+            level=logging.DEBUG, use_color=False, log_file=logfile
+        )
+
         device_connection = create_connection(
             device=args.device,
             baudrate=args.baudrate,
@@ -527,19 +770,13 @@ def main() -> int:
             hdlc_encoding=args.hdlc_encoding,
             channel_id=args.channel_id,
             serial_suffix=serial_suffix,
+            detokenize_auto_update=args.detokenize_auto_update,
         )
 
-        # Set up log stores for pw_console log windows
-        _DEVICE_LOG = logging.getLogger("pw_rpc_device")
-        _DEVICE_LOG.propagate = False
-        device_log_store = LogStore()
-        root_log_store = LogStore()
-        _DEVICE_LOG.addHandler(device_log_store)
-        logging.getLogger().addHandler(root_log_store)
-
-        logfile = pw_logging.create_temp_log_file()
-        pw_cli.log.install(
-            level=logging.DEBUG, use_color=False, log_file=logfile
+        # The RPC set is fixed by the proto library, so the completer can be
+        # built from the client before the reader thread is started.
+        rpc_completions = flattened_rpc_completions(
+            [device_connection.client.info()]
         )
 
         with device_connection as device_client:
@@ -557,9 +794,7 @@ def main() -> int:
                 },
                 repl_startup_message=WELCOME_MSG,
             )
-            console.add_sentence_completer(
-                flattened_rpc_completions([device_client.info()])
-            )
+            console.add_sentence_completer(rpc_completions)
             console.add_window_plugin(factory_pane)
             console.setup_python_logging(last_resort_filename=logfile)
             console.embed()
@@ -568,6 +803,9 @@ def main() -> int:
     except KeyboardInterrupt:
         print("\nGoodbye!")
         return 0
+    finally:
+        for listener in log_listeners:
+            listener.stop()
 
 
 if __name__ == "__main__":
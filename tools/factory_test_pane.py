@@ -11,15 +11,24 @@ activate a pattern and wait for operator confirmation.
 from __future__ import annotations
 
 import enum
+import functools
 import logging
 import os
+import queue
+import threading
 import time
 from dataclasses import dataclass, field
+from typing import Callable
 
 from prompt_toolkit.filters import has_focus
 from prompt_toolkit.formatted_text import FormattedText
 from prompt_toolkit.key_binding import KeyBindings, KeyPressEvent
-from prompt_toolkit.layout import FormattedTextControl, Window, WindowAlign
+from prompt_toolkit.layout import (
+    FormattedTextControl,
+    UIContent,
+    Window,
+    WindowAlign,
+)
 from prompt_toolkit.mouse_events import MouseEvent, MouseEventType
 
 from pw_console.plugin_mixin import PluginMixin
@@ -29,6 +38,19 @@ from pw_console.get_pw_console_app import get_pw_console_app
 
 _LOG = logging.getLogger(__name__)
 
+# How long the plugin callback blocks waiting for a run request before
+# returning to PluginMixin. Requests wake it immediately; this only bounds
+# how often an idle pane re-checks for pending redraws.
+_RUN_WAIT_S = 2.0
+
+# Constant fragments reused by every render of the checklist.
+_NL = ("", "\n")
+_SP = ("", " ")
+_INDENT = ("", "       ")
+_SEP_LINE = ("class:theme-fg-dim", "  " + "\u2500" * 38)
+_PREFIX_SELECTED = ("", " > ")
+_PREFIX_UNSELECTED = ("", "   ")
+
 
 class StepStatus(enum.Enum):
     PENDING = "pending"
@@ -44,6 +66,17 @@ class StepMode(enum.Enum):
     VISUAL = "visual"
 
 
+# Checklist icon and style per step status.
+_STATUS_ICON: dict[StepStatus, tuple[str, str]] = {
+    StepStatus.PENDING: (" ", ""),
+    StepStatus.RUNNING: ("~", "class:theme-fg-cyan"),
+    StepStatus.CONFIRM: ("?", "class:theme-fg-yellow"),
+    StepStatus.PASSED: ("\u2713", "class:theme-fg-green"),
+    StepStatus.FAILED: ("\u2717", "class:theme-fg-red"),
+    StepStatus.SKIPPED: ("-", "class:theme-fg-dim"),
+}
+
+
 @dataclass
 class TestStep:
     name: str
@@ -53,6 +86,15 @@ class TestStep:
     duration: float | None = None
 
 
+def _shows_message(step: TestStep) -> bool:
+    """Whether the step's message is rendered on a line of its own."""
+    return bool(step.message) and step.status in (
+        StepStatus.RUNNING,
+        StepStatus.CONFIRM,
+        StepStatus.FAILED,
+    )
+
+
 class FactoryTestControl(FormattedTextControl):
     """Rendering control with key bindings for the factory test pane."""
 
@@ -98,6 +140,16 @@ class FactoryTestControl(FormattedTextControl):
         kwargs["key_bindings"] = key_bindings
         super().__init__(*args, **kwargs)
 
+    def create_content(self, width: int, height: int) -> UIContent:
+        # The text for this render may already have been built for the
+        # previous height (there is none before the first paint). When the
+        # height changed, record it and repaint once so the visible range
+        # follows the pane even when nothing else would redraw it.
+        if height != self.pane.render_height:
+            self.pane.render_height = height
+            self.pane.redraw_ui()
+        return super().create_content(width, height)
+
     def mouse_handler(self, mouse_event: MouseEvent):
         if not has_focus(self.pane)():
             if mouse_event.event_type == MouseEventType.MOUSE_UP:
@@ -109,31 +161,92 @@ class FactoryTestControl(FormattedTextControl):
 class FactoryTestPane(WindowPane, PluginMixin):
     """Interactive factory test checklist for pw_console."""
 
+    # (key, description, mouse handler method name or None)
+    _TOOLBAR_BUTTONS: tuple[tuple[str, str, str | None], ...] = (
+        ("Enter", "Run", None),
+        ("a", "Run All", None),
+        ("p", "Pass", None),
+        ("f", "Fail", None),
+        ("s", "Skip", None),
+        ("r", "Reset", "reset_all"),
+    )
+
     def __init__(self, device=None, *args, **kwargs):
         super().__init__(*args, pane_title="Factory Test", **kwargs)
         self._device = device
 
+        led = self._step_led_set_all
+        button = self._step_button
+        # (name, mode, handler) — handlers take the TestStep being run.
+        checklist: list[tuple[str, StepMode, Callable[[TestStep], None]]] = [
+            ("Echo Test", StepMode.AUTO, self._step_echo),
+            ("LED Red", StepMode.VISUAL, functools.partial(led, "RED", r=255)),
+            (
+                "LED Green",
+                StepMode.VISUAL,
+                functools.partial(led, "GREEN", g=255),
+            ),
+            (
+                "LED Blue",
+                StepMode.VISUAL,
+                functools.partial(led, "BLUE", b=255),
+            ),
+            (
+                "LED White",
+                StepMode.VISUAL,
+                functools.partial(led, "WHITE", w=255),
+            ),
+            ("LED Clear", StepMode.AUTO, self._step_led_clear),
+            ("Buzzer Beep", StepMode.VISUAL, self._step_buzzer),
+            (
+                "Button UP",
+                StepMode.AUTO,
+                functools.partial(button, "button_up", "UP"),
+            ),
+            (
+                "Button DOWN",
+                StepMode.AUTO,
+                functools.partial(button, "button_down", "DOWN"),
+            ),
+            (
+                "Button OK",
+                StepMode.AUTO,
+                functools.partial(button, "button_ok", "OK"),
+            ),
+            (
+                "Button Cancel",
+                StepMode.AUTO,
+                functools.partial(button, "button_cancel", "Cancel"),
+            ),
+            ("Display White", StepMode.VISUAL, self._step_display_white),
+            ("Display Color Bars", StepMode.VISUAL, self._step_color_bars),
+            ("Check Secrets", StepMode.AUTO, self._step_check_secrets),
+            ("Provision Secrets", StepMode.AUTO, self._step_provision),
+            ("Verify Provisioned", StepMode.AUTO, self._step_verify),
+        ]
         self._steps: list[TestStep] = [
-            TestStep("Echo Test", StepMode.AUTO),
-            TestStep("LED Red", StepMode.VISUAL),
-            TestStep("LED Green", StepMode.VISUAL),
-            TestStep("LED Blue", StepMode.VISUAL),
-            TestStep("LED White", StepMode.VISUAL),
-            TestStep("LED Clear", StepMode.AUTO),
-            TestStep("Buzzer Beep", StepMode.VISUAL),
-            TestStep("Button UP", StepMode.AUTO),
-            TestStep("Button DOWN", StepMode.AUTO),
-            TestStep("Button OK", StepMode.AUTO),
-            TestStep("Button Cancel", StepMode.AUTO),
-            TestStep("Display White", StepMode.VISUAL),
-            TestStep("Display Color Bars", StepMode.VISUAL),
-            TestStep("Check Secrets", StepMode.AUTO),
-            TestStep("Provision Secrets", StepMode.AUTO),
-            TestStep("Verify Provisioned", StepMode.AUTO),
+            TestStep(name, mode) for name, mode, _ in checklist
         ]
+        self._step_handlers: tuple[Callable[[TestStep], None], ...] = tuple(
+            handler for _, _, handler in checklist
+        )
+        # Read once: the secrets env vars don't change while the console
+        # runs, and reset_all keeps them.
+        self._expected_keys = self._load_expected_keys()
         self._selected: int = 0
-        self._run_request: int | None = None
+        # Step indices queued by the UI thread for the plugin thread.
+        self._run_queue: queue.Queue[int] = queue.Queue()
+        # Guards _selected and _run_all_mode, which both the UI thread and
+        # the plugin thread read and update.
+        self._lock = threading.Lock()
         self._run_all_mode: bool = False
+        # Set whenever step or selection state changes; cleared by the
+        # next redraw so idle wakeups and no-op keys don't repaint.
+        self._dirty: bool = False
+        self._render_cache_key: tuple | None = None
+        self._render_cache_value: FormattedText | None = None
+        # Height of the last render, set by FactoryTestControl.
+        self.render_height: int | None = None
 
         self._control = FactoryTestControl(
             self,
@@ -150,28 +263,16 @@ class FactoryTestPane(WindowPane, PluginMixin):
         )
 
         self.bottom_toolbar = WindowPaneToolbar(self)
-        self.bottom_toolbar.add_button(
-            ToolbarButton(key="Enter", description="Run")
-        )
-        self.bottom_toolbar.add_button(
-            ToolbarButton(key="a", description="Run All")
-        )
-        self.bottom_toolbar.add_button(
-            ToolbarButton(key="p", description="Pass")
-        )
-        self.bottom_toolbar.add_button(
-            ToolbarButton(key="f", description="Fail")
-        )
-        self.bottom_toolbar.add_button(
-            ToolbarButton(key="s", description="Skip")
-        )
-        self.bottom_toolbar.add_button(
-            ToolbarButton(
-                key="r",
-                description="Reset",
-                mouse_handler=self.reset_all,
+        for key, description, handler_name in self._TOOLBAR_BUTTONS:
+            self.bottom_toolbar.add_button(
+                ToolbarButton(
+                    key=key,
+                    description=description,
+                    mouse_handler=(
+                        getattr(self, handler_name) if handler_name else None
+                    ),
+                )
             )
-        )
 
         self.container = self._create_pane_container(
             self._window,
@@ -180,94 +281,151 @@ class FactoryTestPane(WindowPane, PluginMixin):
 
         self.plugin_init(
             plugin_callback=self._background_task,
-            plugin_callback_frequency=0.3,
+            plugin_callback_frequency=0.0,
             plugin_logger_name="factory_test_pane",
         )
 
     # ── Navigation ────────────────────────────────────────────────────
 
     def select_next(self) -> None:
-        if self._selected < len(self._steps) - 1:
+        with self._lock:
+            if self._selected >= len(self._steps) - 1:
+                return
             self._selected += 1
-            self.redraw_ui()
+            self._dirty = True
+        self._redraw_if_dirty()
 
     def select_prev(self) -> None:
-        if self._selected > 0:
+        with self._lock:
+            if self._selected <= 0:
+                return
             self._selected -= 1
-            self.redraw_ui()
+            self._dirty = True
+        self._redraw_if_dirty()
 
-    # ── Actions (UI thread → background thread via flag) ──────────────
+    # ── Actions (UI thread → background thread via queue) ─────────────
 
     def run_selected(self) -> None:
-        step = self._steps[self._selected]
-        if step.status in (StepStatus.RUNNING, StepStatus.CONFIRM):
-            return
-        self._run_all_mode = False
-        self._run_request = self._selected
+        with self._lock:
+            step = self._steps[self._selected]
+            if step.status in (StepStatus.RUNNING, StepStatus.CONFIRM):
+                return
+            self._run_all_mode = False
+            self._run_queue.put(self._selected)
 
     def run_all(self) -> None:
-        self._run_all_mode = True
-        # Find first non-completed step
-        for i, step in enumerate(self._steps):
-            if step.status not in (
-                StepStatus.PASSED,
-                StepStatus.FAILED,
-                StepStatus.SKIPPED,
-            ):
-                self._run_request = i
-                self._selected = i
-                break
+        with self._lock:
+            self._run_all_mode = True
+            # Find first non-completed step
+            for i, step in enumerate(self._steps):
+                if step.status not in (
+                    StepStatus.PASSED,
+                    StepStatus.FAILED,
+                    StepStatus.SKIPPED,
+                ):
+                    self._run_queue.put(i)
+                    if self._selected != i:
+                        self._selected = i
+                        self._dirty = True
+                    break
 
     def confirm_pass(self) -> None:
-        step = self._steps[self._selected]
-        if step.status == StepStatus.CONFIRM:
+        with self._lock:
+            step = self._steps[self._selected]
+            if step.status != StepStatus.CONFIRM:
+                return
             step.status = StepStatus.PASSED
+            self._dirty = True
             self._advance_after_complete()
-            self.redraw_ui()
+        self._redraw_if_dirty()
 
     def confirm_fail(self) -> None:
-        step = self._steps[self._selected]
-        if step.status == StepStatus.CONFIRM:
+        with self._lock:
+            step = self._steps[self._selected]
+            if step.status != StepStatus.CONFIRM:
+                return
             step.status = StepStatus.FAILED
+            self._dirty = True
             self._run_all_mode = False
             self._advance_after_complete()
-            self.redraw_ui()
+        self._redraw_if_dirty()
 
     def skip_selected(self) -> None:
-        step = self._steps[self._selected]
-        if step.status in (StepStatus.PENDING, StepStatus.CONFIRM):
+        with self._lock:
+            step = self._steps[self._selected]
+            if step.status not in (StepStatus.PENDING, StepStatus.CONFIRM):
+                return
             step.status = StepStatus.SKIPPED
+            self._dirty = True
             self._advance_after_complete()
-            self.redraw_ui()
+        self._redraw_if_dirty()
 
     def reset_all(self) -> None:
-        self._run_all_mode = False
-        self._run_request = None
-        for step in self._steps:
-            step.status = StepStatus.PENDING
-            step.message = ""
-            step.duration = None
-        self._selected = 0
-        self.redraw_ui()
+        with self._lock:
+            self._run_all_mode = False
+            self._drain_run_queue()
+            for step in self._steps:
+                if (
+                    step.status != StepStatus.PENDING
+                    or step.message
+                    or step.duration is not None
+                ):
+                    step.status = StepStatus.PENDING
+                    step.message = ""
+                    step.duration = None
+                    self._dirty = True
+            if self._selected != 0:
+                self._selected = 0
+                self._dirty = True
+        self._redraw_if_dirty()
 
     def _advance_after_complete(self) -> None:
-        """Move selection to next step; trigger next run in run-all mode."""
+        """Move selection to next step; trigger next run in run-all mode.
+
+        Must be called with self._lock held.
+        """
         if self._selected < len(self._steps) - 1:
             self._selected += 1
+            self._dirty = True
             if self._run_all_mode:
-                self._run_request = self._selected
+                self._run_queue.put(self._selected)
+
+    def _drain_run_queue(self) -> int | None:
+        """Discard queued run requests, returning the most recent one."""
+        idx = None
+        while True:
+            try:
+                idx = self._run_queue.get_nowait()
+            except queue.Empty:
+                return idx
+
+    def _take_dirty(self) -> bool:
+        """Clear the dirty flag, returning whether a redraw is due."""
+        dirty = self._dirty
+        self._dirty = False
+        return dirty
+
+    def _redraw_if_dirty(self) -> None:
+        if self._take_dirty():
+            self.redraw_ui()
 
     # ── Background task (runs in PluginMixin thread) ──────────────────
 
     def _background_task(self) -> bool:
-        if self._run_request is None:
-            return False
-
-        idx = self._run_request
-        self._run_request = None
+        # PluginMixin redraws when this returns True, so only report a
+        # change when the checklist actually needs repainting.
+        try:
+            idx = self._run_queue.get(timeout=_RUN_WAIT_S)
+        except queue.Empty:
+            return self._take_dirty()
+        # Requests made while the previous step ran collapse into the
+        # latest one, as with a single pending-request slot.
+        latest = self._drain_run_queue()
+        if latest is not None:
+            idx = latest
 
         if idx < 0 or idx >= len(self._steps):
-            return False
+            return self._take_dirty()
 
         step = self._steps[idx]
         step.status = StepStatus.RUNNING
@@ -283,111 +441,116 @@ class FactoryTestPane(WindowPane, PluginMixin):
             step.status = StepStatus.FAILED
             step.message = str(exc)
             _LOG.error("Step %d (%s) failed: %s", idx, step.name, exc)
-            self._run_all_mode = False
+            with self._lock:
+                self._run_all_mode = False
 
         elapsed = time.monotonic() - start
         step.duration = elapsed
 
         # For auto steps that succeeded, advance
         if step.status == StepStatus.PASSED:
-            self._advance_after_complete()
+            with self._lock:
+                self._advance_after_complete()
 
+        self._dirty = False
         return True
 
     def _execute_step(self, idx: int, step: TestStep) -> None:
         """Run the RPC for a given step. Called from background thread."""
-        rpcs = self._device.rpcs
-        factory = rpcs.maco.factory.FactoryTestService
-        secrets = rpcs.maco.secrets.DeviceSecretsService
-
-        if idx == 0:  # Echo Test
-            resp = rpcs.maco.MacoService.Echo(data=b"hello")
-            if resp.status.ok() and resp.response.data == b"hello":
-                step.status = StepStatus.PASSED
-                step.message = "Echo OK"
-            else:
-                step.status = StepStatus.FAILED
-                step.message = "Echo mismatch"
-
-        elif idx == 1:  # LED Red
-            factory.LedSetAll(r=255, g=0, b=0, w=0)
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify LEDs are RED"
-
-        elif idx == 2:  # LED Green
-            factory.LedSetAll(r=0, g=255, b=0, w=0)
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify LEDs are GREEN"
-
-        elif idx == 3:  # LED Blue
-            factory.LedSetAll(r=0, g=0, b=255, w=0)
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify LEDs are BLUE"
-
-        elif idx == 4:  # LED White
-            factory.LedSetAll(r=0, g=0, b=0, w=255)
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify LEDs are WHITE"
-
-        elif idx == 5:  # LED Clear
-            factory.LedClear()
+        self._step_handlers[idx](step)
+
+    # ── Step handlers ─────────────────────────────────────────────────
+
+    @functools.cached_property
+    def _maco_service(self):
+        return self._device.rpcs.maco.MacoService
+
+    @functools.cached_property
+    def _factory_service(self):
+        return self._device.rpcs.maco.factory.FactoryTestService
+
+    @functools.cached_property
+    def _secrets_service(self):
+        return self._device.rpcs.maco.secrets.DeviceSecretsService
+
+    def _step_echo(self, step: TestStep) -> None:
+        resp = self._maco_service.Echo(data=b"hello")
+        if resp.status.ok() and resp.response.data == b"hello":
             step.status = StepStatus.PASSED
-            step.message = "LEDs cleared"
-
-        elif idx == 6:  # Buzzer Beep
-            factory.BuzzerBeep(frequency_hz=2000, duration_ms=500)
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify buzzer tone is audible"
-
-        elif idx in (7, 8, 9, 10):  # Button tests
-            button_map = {
-                7: ("button_up", "UP"),
-                8: ("button_down", "DOWN"),
-                9: ("button_ok", "OK"),
-                10: ("button_cancel", "Cancel"),
-            }
-            field, label = button_map[idx]
-            self._poll_button(factory, step, field, label)
+            step.message = "Echo OK"
+        else:
+            step.status = StepStatus.FAILED
+            step.message = "Echo mismatch"
+
+    def _step_led_set_all(
+        self,
+        color_name: str,
+        step: TestStep,
+        *,
+        r: int = 0,
+        g: int = 0,
+        b: int = 0,
+        w: int = 0,
+    ) -> None:
+        self._factory_service.LedSetAll(r=r, g=g, b=b, w=w)
+        step.status = StepStatus.CONFIRM
+        step.message = f"Verify LEDs are {color_name}"
 
-        elif idx == 11:  # Display White
-            factory.DisplayFillColor(r=255, g=255, b=255)
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify display is WHITE"
+    def _step_led_clear(self, step: TestStep) -> None:
+        self._factory_service.LedClear()
+        step.status = StepStatus.PASSED
+        step.message = "LEDs cleared"
 
-        elif idx == 12:  # Display Color Bars
-            factory.DisplayColorBars()
-            step.status = StepStatus.CONFIRM
-            step.message = "Verify color bars on display"
+    def _step_buzzer(self, step: TestStep) -> None:
+        self._factory_service.BuzzerBeep(frequency_hz=2000, duration_ms=500)
+        step.status = StepStatus.CONFIRM
+        step.message = "Verify buzzer tone is audible"
 
-        elif idx == 13:  # Check Secrets
-            self._check_secrets(secrets, step)
+    def _step_button(self, field: str, label: str, step: TestStep) -> None:
+        self._poll_button(self._factory_service, step, field, label)
 
-        elif idx == 14:  # Provision Secrets
-            self._provision_secrets(secrets, step)
+    def _step_display_white(self, step: TestStep) -> None:
+        self._factory_service.DisplayFillColor(r=255, g=255, b=255)
+        step.status = StepStatus.CONFIRM
+        step.message = "Verify display is WHITE"
 
-        elif idx == 15:  # Verify Provisioned
-            self._verify_secrets(
-                secrets, step, missing_msg="NOT provisioned"
-            )
+    def _step_color_bars(self, step: TestStep) -> None:
+        self._factory_service.DisplayColorBars()
+        step.status = StepStatus.CONFIRM
+        step.message = "Verify color bars on display"
+
+    def _step_check_secrets(self, step: TestStep) -> None:
+        self._check_secrets(self._secrets_service, step)
+
+    def _step_provision(self, step: TestStep) -> None:
+        self._provision_secrets(self._secrets_service, step)
+
+    def _step_verify(self, step: TestStep) -> None:
+        self._verify_secrets(
+            self._secrets_service, step, missing_msg="NOT provisioned"
+        )
 
     # ── Secrets steps ─────────────────────────────────────────────────
 
     @staticmethod
-    def _expected_keys() -> tuple[bytes, bytes] | str:
+    def _load_expected_keys() -> tuple[bytes, bytes] | str:
         """Return (gateway, ntag) from env, or an error message."""
         gw_hex = os.environ.get("FACTORY_GATEWAY_SECRET", "")
         ntag_hex = os.environ.get("FACTORY_NTAG_KEY", "")
         if not gw_hex or not ntag_hex:
             return "Env vars not set"
-        gw_bytes = bytes.fromhex(gw_hex)
-        ntag_bytes = bytes.fromhex(ntag_hex)
+        try:
+            gw_bytes = bytes.fromhex(gw_hex)
+            ntag_bytes = bytes.fromhex(ntag_hex)
+        except ValueError:
+            return "Secrets must be hex"
         if len(gw_bytes) != 16 or len(ntag_bytes) != 16:
             return "Secrets must be 16 bytes"
         return gw_bytes, ntag_bytes
 
     def _check_secrets(self, secrets, step: TestStep) -> None:
         """Report whether stored secrets are missing, match, or mismatch."""
-        keys = self._expected_keys()
+        keys = self._expected_keys
         if isinstance(keys, str):
             # Env not set — fall back to provisioned-bit only.
             resp = secrets.GetStatus()
@@ -401,7 +564,7 @@ class FactoryTestPane(WindowPane, PluginMixin):
         self._verify_secrets(secrets, step, missing_msg="NOT PROVISIONED")
 
     def _provision_secrets(self, secrets, step: TestStep) -> None:
-        keys = self._expected_keys()
+        keys = self._expected_keys
         if isinstance(keys, str):
             step.status = StepStatus.SKIPPED
             step.message = keys
@@ -426,7 +589,7 @@ class FactoryTestPane(WindowPane, PluginMixin):
         self, secrets, step: TestStep, *, missing_msg: str
     ) -> None:
         """Compare stored keys to env candidates via the Verify RPC."""
-        keys = self._expected_keys()
+        keys = self._expected_keys
         if isinstance(keys, str):
             step.status = StepStatus.FAILED
             step.message = keys
@@ -476,8 +639,20 @@ class FactoryTestPane(WindowPane, PluginMixin):
     # ── Rendering ─────────────────────────────────────────────────────
 
     def _get_formatted_text(self) -> FormattedText:
+        height = self.render_height
+
+        # prompt_toolkit calls this on every redraw; reuse the last result
+        # while neither the selection, the pane height nor any step has
+        # changed.
+        cache_key = (
+            self._selected,
+            height,
+            tuple((s.status, s.message, s.duration) for s in self._steps),
+        )
+        if cache_key == self._render_cache_key:
+            return self._render_cache_value
+
         fragments: list[tuple[str, str]] = []
-        nl = ("", "\n")
 
         done = sum(
             1
@@ -488,19 +663,26 @@ class FactoryTestPane(WindowPane, PluginMixin):
         total = len(self._steps)
 
         # Header
-        fragments.append(("class:theme-fg-cyan", f"  Factory Test ({done}/{total})"))
-        fragments.append(nl)
-        fragments.append(("class:theme-fg-dim", "  " + "\u2500" * 38))
-        fragments.append(nl)
+        fragments += [
+            ("class:theme-fg-cyan", f"  Factory Test ({done}/{total})"),
+            _NL,
+            _SEP_LINE,
+            _NL,
+        ]
 
-        for i, step in enumerate(self._steps):
-            is_selected = i == self._selected
+        first, last = self._visible_range(height)
+        if first > 0:
+            fragments += [
+                ("class:theme-fg-dim", f"   \u2191 {first} more"),
+                _NL,
+            ]
 
-            # Selection indicator
-            prefix = " > " if is_selected else "   "
+        for i in range(first, last):
+            step = self._steps[i]
+            is_selected = i == self._selected
 
             # Status icon
-            icon, icon_style = self._status_icon(step.status)
+            icon, icon_style = _STATUS_ICON[step.status]
 
             # Line style
             name_style = ""
@@ -513,50 +695,72 @@ class FactoryTestPane(WindowPane, PluginMixin):
             elif step.status == StepStatus.SKIPPED:
                 name_style = "class:theme-fg-dim"
 
-            fragments.append(("", prefix))
-            fragments.append((icon_style, f"[{icon}]"))
-            fragments.append(("", " "))
-            fragments.append((name_style, step.name))
+            fragments += [
+                _PREFIX_SELECTED if is_selected else _PREFIX_UNSELECTED,
+                (icon_style, f"[{icon}]"),
+                _SP,
+                (name_style, step.name),
+            ]
 
             # Duration (right-aligned after name)
             if step.duration is not None:
                 fragments.append(
                     ("class:theme-fg-dim", f"  {step.duration:.1f}s")
                 )
-            fragments.append(nl)
+            fragments.append(_NL)
 
             # Status message on next line (indented)
-            if step.message and step.status in (
-                StepStatus.RUNNING,
-                StepStatus.CONFIRM,
-                StepStatus.FAILED,
-            ):
+            if _shows_message(step):
                 msg_style = "class:theme-fg-dim"
                 if step.status == StepStatus.CONFIRM:
                     msg_style = "class:theme-fg-yellow"
                 elif step.status == StepStatus.FAILED:
                     msg_style = "class:theme-fg-red"
-                fragments.append(("", "       "))
-                fragments.append((msg_style, step.message))
-                fragments.append(nl)
+                fragments += [_INDENT, (msg_style, step.message), _NL]
 
-        return FormattedText(fragments)
+        if last < total:
+            fragments += [
+                ("class:theme-fg-dim", f"   \u2193 {total - last} more"),
+                _NL,
+            ]
 
-    @staticmethod
-    def _status_icon(status: StepStatus) -> tuple[str, str]:
-        match status:
-            case StepStatus.PENDING:
-                return " ", ""
-            case StepStatus.RUNNING:
-                return "~", "class:theme-fg-cyan"
-            case StepStatus.CONFIRM:
-                return "?", "class:theme-fg-yellow"
-            case StepStatus.PASSED:
-                return "\u2713", "class:theme-fg-green"
-            case StepStatus.FAILED:
-                return "\u2717", "class:theme-fg-red"
-            case StepStatus.SKIPPED:
-                return "-", "class:theme-fg-dim"
+        self._render_cache_key = cache_key
+        self._render_cache_value = FormattedText(fragments)
+        return self._render_cache_value
+
+    def _visible_range(self, height: int | None) -> tuple[int, int]:
+        """Return the [first, last) slice of steps that fits the pane.
+
+        Grows outward from the selected step so it always stays visible.
+        Before the first render the height is unknown and all steps are
+        shown.
+        """
+        total = len(self._steps)
+        if height is None:
+            return 0, total
+
+        # Two header lines; each step takes one line plus its message.
+        budget = height - 2
+        rows = [1 + _shows_message(step) for step in self._steps]
+        if sum(rows) <= budget:
+            return 0, total
+        # Leave room for the "more" markers above and below.
+        budget -= 2
+
+        first = last = self._selected
+        used = rows[first]
+        grew = True
+        while grew:
+            grew = False
+            if last + 1 < total and used + rows[last + 1] <= budget:
+                last += 1
+                used += rows[last]
+                grew = True
+            if first > 0 and used + rows[first - 1] <= budget:
+                first -= 1
+                used += rows[first]
+                grew = True
+        return first, last + 1
 
     def get_all_key_bindings(self) -> list:
         return [
@@ -7,7 +7,11 @@ Port of functions/src/ntag/key_diversification.ts.
 Based on NXP Application Note AN10922.
 """
 
+import functools
+from collections.abc import Iterable
+
 from Crypto.Cipher import AES
+from Crypto.Hash import CMAC
 
 # Diversification constants per key slot
 KEY_IDS: dict[str, bytes] = {
@@ -18,45 +22,110 @@ KEY_IDS: dict[str, bytes] = {
     "reserved2": b"\x00\x00\x05",
 }
 
-_Rb = b"\x00" * 15 + b"\x87"
 
+@functools.lru_cache(maxsize=8)
+def _encode_system_name(system_name: str) -> bytes:
+    return system_name.encode("utf-8")
+
+
+# AN10922 limits the CMAC input to 32 bytes: 0x01 || UID (7) || key ID (3)
+# leaves 21 bytes for the system name.
+_MAX_SYSTEM_NAME_LEN = 32 - 1 - 7 - 3
+
+
+def _system_name_bytes(system_name: str | bytes) -> bytes:
+    if isinstance(system_name, bytes):
+        system_bytes = system_name
+    else:
+        system_bytes = _encode_system_name(system_name)
+    if len(system_bytes) > _MAX_SYSTEM_NAME_LEN:
+        raise ValueError(
+            f"system_name must be at most {_MAX_SYSTEM_NAME_LEN} bytes, "
+            f"got {len(system_bytes)}"
+        )
+    return system_bytes
+
+
+# AN10922 pads the CMAC input to 32 bytes and masks the last block with K2.
+# Plain CMAC only pads to the next 16-byte block, so it agrees with AN10922
+# only when the input spans more than one block, i.e. the system name is
+# longer than this.
+_SHORT_SYSTEM_NAME_LEN = 16 - 1 - 7 - 3
+
+_Rb = 0x87
+_MASK_128 = (1 << 128) - 1
 
-def _aes_ecb_encrypt_block(key: bytes, block: bytes) -> bytes:
-    return AES.new(key, AES.MODE_ECB).encrypt(block)
 
+def _left_shift(n: int) -> int:
+    """Shift a 128-bit block left by one, applying Rb on carry-out."""
+    shifted = (n << 1) & _MASK_128
+    return shifted ^ _Rb if n >> 127 else shifted
 
-def _aes_cbc_encrypt(key: bytes, data: bytes) -> bytes:
-    cipher = AES.new(key, AES.MODE_CBC, iv=b"\x00" * 16)
-    return cipher.encrypt(data)
 
+def _short_input_key(master_key: bytes) -> tuple:
+    """Return an ECB cipher for master_key and its CMAC subkey K2."""
+    cipher = AES.new(master_key, AES.MODE_ECB)
+    k0 = int.from_bytes(cipher.encrypt(b"\x00" * 16), "big")
+    return cipher, _left_shift(_left_shift(k0))
 
-def _left_shift(data: bytes) -> bytearray:
-    out = bytearray(16)
-    for i in range(15):
-        out[i] = ((data[i] << 1) | (data[i + 1] >> 7)) & 0xFF
-    out[15] = (data[15] << 1) & 0xFF
-    return out
 
+def _padded_cmac(short_key: tuple, message: bytes) -> bytes:
+    """AN10922 CMAC of a message shorter than 16 bytes, padded to 32."""
+    cipher, k2 = short_key
+    padded = message + b"\x80" + bytes(31 - len(message))
+    c0 = int.from_bytes(cipher.encrypt(padded[:16]), "big")
+    block1 = int.from_bytes(padded[16:], "big") ^ k2 ^ c0
+    return cipher.encrypt(block1.to_bytes(16, "big"))
 
-def _generate_subkeys(master_key: bytes) -> tuple[bytes, bytes]:
-    k0 = _aes_ecb_encrypt_block(master_key, b"\x00" * 16)
 
-    k1 = _left_shift(k0)
-    if k0[0] & 0x80:
-        for i in range(16):
-            k1[i] ^= _Rb[i]
+def _keyed_cmac(master_key: bytes):
+    """Return an empty CMAC state for master_key, subkeys already derived."""
+    if len(master_key) != 16:
+        raise ValueError(f"master_key must be 16 bytes, got {len(master_key)}")
+    return CMAC.new(master_key, ciphermod=AES)
 
-    k2 = _left_shift(k1)
-    if k1[0] & 0x80:
-        for i in range(16):
-            k2[i] ^= _Rb[i]
 
-    return bytes(k1), bytes(k2)
+def _check_tag_uid(tag_uid: bytes) -> None:
+    if len(tag_uid) != 7:
+        raise ValueError(f"tag_uid must be 7 bytes, got {len(tag_uid)}")
+
+
+def _diversify_all(
+    master_key: bytes,
+    keyed_cmac,
+    system_bytes: bytes,
+    tag_uid: bytes,
+    key_names,
+) -> dict[str, bytes]:
+    """Diversify several key slots from one CMAC state.
+
+    The CMAC input is 0x01 || UID || key ID || system name, so the subkeys
+    and the 0x01 || UID prefix are absorbed once and copied per slot.
+    Inputs are validated by the public callers.
+    """
+    if len(system_bytes) <= _SHORT_SYSTEM_NAME_LEN:
+        short_key = _short_input_key(master_key)
+        return {
+            key_name: _padded_cmac(
+                short_key, b"\x01" + tag_uid + KEY_IDS[key_name] + system_bytes
+            )
+            for key_name in key_names
+        }
+
+    prefix = keyed_cmac.copy()
+    prefix.update(b"\x01" + tag_uid)
+
+    result = {}
+    for key_name in key_names:
+        mac = prefix.copy()
+        mac.update(KEY_IDS[key_name] + system_bytes)
+        result[key_name] = mac.digest()
+    return result
 
 
 def diversify_key(
     master_key: bytes,
-    system_name: str,
+    system_name: str | bytes,
     tag_uid: bytes,
     key_name: str,
 ) -> bytes:
@@ -64,48 +133,71 @@ def diversify_key(
 
     Args:
         master_key: 16-byte AES-128 master key.
-        system_name: System identifier string (e.g. "OwwMachineAuth").
+        system_name: System identifier string (e.g. "OwwMachineAuth"), or
+                     its UTF-8 encoding.
         tag_uid: 7-byte tag UID.
         key_name: One of "application", "terminal", "authorization",
                   "sdm_mac", "reserved2".
 
     Returns:
         16-byte diversified key.
-    """
-    assert len(master_key) == 16
-    assert len(tag_uid) == 7
-    key_id = KEY_IDS[key_name]
-
-    k1, k2 = _generate_subkeys(master_key)
-
-    div_input = tag_uid + key_id + system_name.encode("utf-8")
-    max_len = 31
-    pad_len = max_len - len(div_input)
-    padding = bytes([0x80] + [0x00] * (pad_len - 1)) if pad_len > 0 else b""
-    has_padding = pad_len > 0
-
-    cmac_input = bytearray(b"\x01" + div_input + padding)
-    assert len(cmac_input) == 32
 
-    k = k2 if has_padding else k1
-    for i in range(16):
-        cmac_input[16 + i] ^= k[i]
-
-    encrypted = _aes_cbc_encrypt(master_key, bytes(cmac_input))
-    return encrypted[16:32]
+    Raises:
+        ValueError: master_key or tag_uid has the wrong length, or
+            system_name is longer than 21 bytes in UTF-8.
+    """
+    _check_tag_uid(tag_uid)
+    system_bytes = _system_name_bytes(system_name)
+    keys = _diversify_all(
+        master_key, _keyed_cmac(master_key), system_bytes, tag_uid, (key_name,)
+    )
+    return keys[key_name]
 
 
 def diversify_keys(
     master_key: bytes,
-    system_name: str,
+    system_name: str | bytes,
     tag_uid: bytes,
 ) -> dict[str, bytes]:
     """Compute all diversified keys for a tag.
 
     Returns:
         Dict mapping key name to 16-byte diversified key.
+
+    Raises:
+        ValueError: master_key or tag_uid has the wrong length, or
+            system_name is longer than 21 bytes in UTF-8.
+    """
+    _check_tag_uid(tag_uid)
+    system_bytes = _system_name_bytes(system_name)
+    return _diversify_all(
+        master_key, _keyed_cmac(master_key), system_bytes, tag_uid, KEY_IDS
+    )
+
+
+def diversify_keys_batch(
+    master_key: bytes,
+    system_name: str | bytes,
+    tag_uids: Iterable[bytes],
+) -> list[dict[str, bytes]]:
+    """Compute all diversified keys for several tags.
+
+    Equivalent to calling diversify_keys() per tag, but derives the CMAC
+    subkeys for master_key only once for the whole batch.
+
+    Returns:
+        One dict per tag UID, in order, as returned by diversify_keys().
+
+    Raises:
+        ValueError: master_key or any tag UID has the wrong length, or
+            system_name is longer than 21 bytes in UTF-8.
     """
-    return {
-        name: diversify_key(master_key, system_name, tag_uid, name)
-        for name in KEY_IDS
-    }
+    keyed_cmac = _keyed_cmac(master_key)
+    system_bytes = _system_name_bytes(system_name)
+    result = []
+    for uid in tag_uids:
+        _check_tag_uid(uid)
+        result.append(
+            _diversify_all(master_key, keyed_cmac, system_bytes, uid, KEY_IDS)
+        )
+    return result
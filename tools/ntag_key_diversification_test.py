@@ -4,7 +4,12 @@
 """Verify Python key diversification matches TS implementation."""
 
 import unittest
-from ntag_key_diversification import diversify_key, KEY_IDS
+from ntag_key_diversification import (
+    diversify_key,
+    diversify_keys,
+    diversify_keys_batch,
+    KEY_IDS,
+)
 
 
 class KeyDiversificationTest(unittest.TestCase):
@@ -25,6 +30,47 @@ class KeyDiversificationTest(unittest.TestCase):
         finally:
             KEY_IDS["application"] = original
 
+    def test_short_system_name_vectors(self):
+        """Names of 5 bytes or less are padded to 32 bytes per AN10922."""
+        master_key = bytes.fromhex("00112233445566778899AABBCCDDEEFF")
+        uid = bytes.fromhex("04782E21801D80")
+        self.assertEqual(
+            diversify_key(master_key, "", uid, "application"),
+            bytes.fromhex("8e5ff176021643d8aaa64a25e6ca35df"),
+        )
+        self.assertEqual(
+            diversify_keys(master_key, "abc", uid)["terminal"],
+            bytes.fromhex("5c7685b55b2adf7fc5de226d764b4bf6"),
+        )
+        self.assertEqual(
+            diversify_keys_batch(master_key, "abc", [uid])[0]["sdm_mac"],
+            bytes.fromhex("ac14c6510d8b9b2dd12fa539b16b65a2"),
+        )
+
+    def test_batch_matches_single_tag(self):
+        master_key = bytes.fromhex("00112233445566778899AABBCCDDEEFF")
+        uids = [
+            bytes.fromhex("04782E21801D80"),
+            bytes.fromhex("04000000000000"),
+            bytes.fromhex("04FFFFFFFFFFFF"),
+        ]
+        self.assertEqual(
+            diversify_keys_batch(master_key, "OwwMachineAuth", uids),
+            [diversify_keys(master_key, "OwwMachineAuth", u) for u in uids],
+        )
+
+    def test_rejects_system_name_over_21_bytes(self):
+        master_key = bytes.fromhex("00112233445566778899AABBCCDDEEFF")
+        uid = bytes.fromhex("04782E21801D80")
+        # 21 bytes fills the 32-byte CMAC input exactly.
+        diversify_keys(master_key, "x" * 21, uid)
+        with self.assertRaises(ValueError):
+            diversify_keys(master_key, "x" * 22, uid)
+        with self.assertRaises(ValueError):
+            diversify_key(master_key, "x" * 30, uid, "application")
+        with self.assertRaises(ValueError):
+            diversify_keys_batch(master_key, "x" * 30, [uid])
+
 
 if __name__ == "__main__":
     unittest.main()
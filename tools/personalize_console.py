@@ -17,24 +17,26 @@ Usage:
 """
 
 import argparse
+import atexit
+import concurrent.futures
+import configparser
+import functools
 import glob
 import logging
+import logging.handlers
 import os
+import re
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 from types import ModuleType
-from typing import Callable, Collection
+from typing import Callable, Collection, Iterable
 
 import serial
 import pw_cli
 import pw_cli.log
-from pw_console import embed as pw_embed
-from pw_console import python_logging as pw_logging
-from pw_console import pyserial_wrapper
-from pw_console import socket_client
-from pw_console.log_store import LogStore
 from pw_hdlc import rpc
 from pw_log.log_decoder import timestamp_parser_ms_since_boot
 from pw_stream import stream_readers
@@ -44,7 +46,13 @@ from pw_system.device_connection import (
     add_device_args,
     DeviceConnection,
 )
-from pw_rpc.console_tools.console import flattened_rpc_completions
+
+try:
+    import inotify_simple
+
+    _HAVE_INOTIFY = True
+except ImportError:
+    _HAVE_INOTIFY = False
 
 from maco_pb import maco_service_pb2
 from maco_pb import personalization_service_pb2
@@ -60,7 +68,22 @@ from pw_system_protos import device_service_pb2
 from pw_unit_test_proto import unit_test_pb2
 
 
-_LOG = logging.getLogger(__file__)
+_DEFAULT_PROTOS = (
+    log_pb2,
+    unit_test_pb2,
+    metric_service_pb2,
+    thread_snapshot_service_pb2,
+    file_pb2,
+    echo_pb2,
+    trace_service_pb2,
+    device_service_pb2,
+)
+
+_LOG = logging.getLogger(__name__)
+
+# Chunk size for the RPC reader. A multiple of both the page size and the
+# USB packet sizes (64/512 B), so one read can take a whole burst.
+_READ_CHUNK_SIZE = int(os.environ.get("MACO_SERIAL_READ_BUF", 65536))
 
 
 class _StatePollLogFilter(logging.Filter):
@@ -85,7 +108,11 @@ class ReconnectingSerialClient:
     """Serial client with automatic reconnection on disconnect."""
 
     DEFAULT_TIMEOUT = 0.1
-    DEFAULT_MAX_READ_SIZE = 256
+    # Matches the SelectableReader chunk size so one call can drain a burst.
+    DEFAULT_MAX_READ_SIZE = _READ_CHUNK_SIZE
+    MAX_WRITE_RETRIES = 2
+    # How long a failed write waits for the background reconnect.
+    RECONNECT_WAIT_S = 5.0
 
     def __init__(
         self,
@@ -100,65 +127,156 @@ class ReconnectingSerialClient:
         self._on_disconnect = on_disconnect
         self._timeout = timeout or self.DEFAULT_TIMEOUT
         self._serial_debug = serial_debug
-        self._serial: serial.Serial | None = None
-        self._connected = False
+        if serial_debug:
+            from pw_console import pyserial_wrapper
+
+            serial_impl = pyserial_wrapper.SerialWithLogging
+        else:
+            serial_impl = serial.Serial
+        # One port object for the client's lifetime; reconnects close and
+        # reopen it rather than constructing a new one.
+        self._serial: serial.Serial = serial_impl(
+            baudrate=baudrate, timeout=self._timeout
+        )
+        # Raw descriptor for the read fast path; -1 when unavailable.
+        self._fd = -1
+        # Set while the port is open; the disconnect handler may reconnect
+        # from another thread, so readers and writers wait on this.
+        self._connected = threading.Event()
+        self._closed = False
         self.connect()
 
     def connect(self) -> None:
         self.connect_to(self._device)
 
     def connect_to(self, device: str) -> None:
-        if self._serial is not None:
+        try:
+            self._serial.close()
+        except Exception:
+            pass
+        self._serial.port = device
+        self._serial.open()
+        # USB serial adapters default to a ~16 ms latency timer, which is
+        # added to every RPC round trip. pyserial sets ASYNC_LOW_LATENCY via
+        # TIOCSSERIAL on Linux; other platforms/drivers just don't support it.
+        try:
+            self._serial.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, OSError, ValueError) as e:
+            _LOG.debug("Low-latency mode unavailable on %s: %s", device, e)
+        # Only the Windows backend lets us size the driver queues.
+        if hasattr(self._serial, "set_buffer_size"):
+            self._serial.set_buffer_size(rx_size=65536, tx_size=65536)
+        # Read the POSIX fd directly unless reads should be logged by the
+        # SerialWithLogging wrapper.
+        self._fd = -1
+        if not self._serial_debug:
             try:
-                self._serial.close()
-            except Exception:
+                self._fd = self._serial.fileno()
+            except (AttributeError, NotImplementedError, OSError):
                 pass
-        serial_impl = (
-            pyserial_wrapper.SerialWithLogging
-            if self._serial_debug
-            else serial.Serial
-        )
-        self._serial = serial_impl(
-            device, self._baudrate, timeout=self._timeout,
-        )
         self._device = device
-        self._connected = True
+        self._closed = False
+        self._connected.set()
         _LOG.info("Connected to %s", device)
 
-    def write(self, data: bytes) -> int | None:
-        if not self._connected or self._serial is None:
+    def write(self, data: bytes) -> int:
+        """Write data, reconnecting and resending if the port fails.
+
+        Gives up and re-raises the write error after MAX_WRITE_RETRIES
+        reconnects.
+        """
+        if not self._connected.is_set():
             raise Exception("Serial is not connected.")
-        try:
-            return self._serial.write(data)
-        except (OSError, serial.SerialException) as e:
-            _LOG.error("Write error: %s", e)
-            self._handle_disconnect()
-            return self._serial.write(data) if self._serial else None
+        retries = 0
+        while True:
+            try:
+                return self._serial.write(data)
+            except (OSError, serial.SerialException) as e:
+                _LOG.error("Write error: %s", e)
+                self._handle_disconnect()
+                if retries >= self.MAX_WRITE_RETRIES:
+                    raise
+                retries += 1
+                # The disconnect handler reconnects in the background;
+                # without one, try the last device directly.
+                if self._on_disconnect is None:
+                    self.connect()
+                elif not self._connected.wait(self.RECONNECT_WAIT_S):
+                    raise
 
     def read(self, num_bytes: int = DEFAULT_MAX_READ_SIZE) -> bytes:
-        if not self._connected or self._serial is None:
+        """Read whatever is buffered, up to num_bytes, in one call.
+
+        pyserial's read(n) waits for all n bytes or the timeout, so asking
+        for num_bytes up front stalls partial frames. Take what the driver
+        already has; if nothing, wait for the first byte and then drain the
+        rest of the burst.
+        """
+        if not self._connected.is_set():
             raise Exception("Serial is not connected.")
+        if self._fd >= 0:
+            return self._read_fd(num_bytes)
         try:
-            data = self._serial.read(num_bytes)
-            return data if data else b""
+            waiting = self._serial.in_waiting
+            if waiting:
+                return self._serial.read(min(waiting, num_bytes))
+            data = self._serial.read(1)
+            if data and num_bytes > 1:
+                waiting = self._serial.in_waiting
+                if waiting:
+                    data += self._serial.read(min(waiting, num_bytes - 1))
+            return data
         except (OSError, serial.SerialException) as e:
             _LOG.error("Read error: %s", e)
             self._handle_disconnect()
+            self._wait_reconnected()
             return b""
 
+    def _read_fd(self, num_bytes: int) -> bytes:
+        """Single os.read() on the non-blocking port fd.
+
+        The reader only calls this after select() reported the fd readable,
+        so an empty read means the device hung up, as in pyserial.
+        """
+        try:
+            data = os.read(self._fd, num_bytes)
+        except BlockingIOError:
+            return b""
+        except OSError as e:
+            _LOG.error("Read error: %s", e)
+            self._handle_disconnect()
+            self._wait_reconnected()
+            return b""
+        if not data:
+            _LOG.error("Read error: device returned no data")
+            self._handle_disconnect()
+            self._wait_reconnected()
+        return data
+
+    def _wait_reconnected(self) -> None:
+        """Park the reader thread until the port is open again.
+
+        SelectableReader select()s on fileno() right after a read returns,
+        which fails while the port is closed. Returns early on close().
+        """
+        if self._on_disconnect is None:
+            return
+        while not self._connected.wait(self.DEFAULT_TIMEOUT):
+            if self._closed:
+                return
+
     def _handle_disconnect(self) -> None:
-        self._connected = False
-        if self._serial:
-            try:
-                self._serial.close()
-            except Exception:
-                pass
-            self._serial = None
+        self._connected.clear()
+        self._fd = -1
+        try:
+            self._serial.close()
+        except Exception:
+            pass
         if self._on_disconnect:
             self._on_disconnect(self)
 
     def fileno(self) -> int:
-        if self._serial is None:
+        if not self._serial.is_open:
             return -1
         try:
             return self._serial.fileno()
@@ -166,24 +284,105 @@ class ReconnectingSerialClient:
             return -1
 
     def close(self) -> None:
-        if self._serial:
-            self._serial.close()
-            self._serial = None
-        self._connected = False
-
-
-def wait_for_device(device_path: str, timeout: float = 30.0) -> bool:
-    """Wait for device to appear at the given path."""
-    start = time.time()
-    while time.time() - start < timeout:
-        if '*' in device_path:
-            matches = glob.glob(device_path)
-            if matches:
-                return True
-        elif os.path.exists(device_path):
-            return True
+        self._closed = True
+        self._serial.close()
+        self._fd = -1
+        self._connected.clear()
+
+
+def _find_device(device_path: str) -> str | None:
+    """Return the path matching device_path (may be a glob), if present."""
+    if '*' in device_path:
+        directory, name = os.path.split(device_path)
+        literal = directory + name.replace('*', '', 1)
+        if not any(c in literal for c in '*?['):
+            return _scan_prefix_suffix(directory or ".", *name.split('*'))
+        matches = glob.glob(device_path)
+        return matches[0] if matches else None
+    return device_path if os.path.exists(device_path) else None
+
+
+def _scan_prefix_suffix(directory: str, prefix: str, suffix: str) -> str | None:
+    """Find an entry named prefix*suffix without compiling a glob pattern.
+
+    Covers the /dev/particle_*<serial> patterns polled while reconnecting.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith(prefix)
+                    and name.endswith(suffix)
+                    and len(name) >= len(prefix) + len(suffix)
+                    and (prefix or not name.startswith('.'))
+                ):
+                    return os.path.join(directory, name)
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _wait_for_device_inotify(device_path: str, timeout: float) -> str | None:
+    """Block on inotify events in the device directory until a match."""
+    directory = os.path.dirname(device_path) or "."
+    deadline = time.monotonic() + timeout
+    with inotify_simple.INotify() as inotify:
+        inotify.add_watch(
+            directory,
+            inotify_simple.flags.CREATE | inotify_simple.flags.MOVED_TO,
+        )
+        # Check after adding the watch so an appearance in between is not
+        # missed.
+        while (found := _find_device(device_path)) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            inotify.read(timeout=int(remaining * 1000) + 1)
+    return found
+
+
+def wait_for_device(device_path: str, timeout: float = 30.0) -> str | None:
+    """Wait for device to appear at the given path.
+
+    Reacts to the udev node being created via inotify when inotify_simple
+    is installed; falls back to polling every 0.5 s otherwise.
+
+    Returns:
+        The matched device path (the first match for a glob pattern), or
+        None on timeout.
+    """
+    # Usually the device is already there; skip setting up a watch.
+    found = _find_device(device_path)
+    if found is not None:
+        return found
+    if _HAVE_INOTIFY:
+        try:
+            return _wait_for_device_inotify(device_path, timeout)
+        except OSError as e:
+            _LOG.debug("inotify unavailable, polling instead: %s", e)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        found = _find_device(device_path)
+        if found is not None:
+            return found
         time.sleep(0.5)
-    return False
+    return None
+
+
+def _wait_ready(device_path: str, timeout: float = 0.5) -> bool:
+    """Wait until the freshly created device node can be opened read/write.
+
+    udev creates the node before it applies the group/mode rules, so
+    opening it right away can fail with EACCES. Polls every 10 ms and
+    returns as soon as access is granted, or False after timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while not os.access(device_path, os.R_OK | os.W_OK):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
 
 
 def _project_root() -> Path:
@@ -193,16 +392,15 @@ def _project_root() -> Path:
     ))
 
 
+# One KEY=value assignment per line. Blank lines, comments and lines
+# without "=" don't match; whitespace around key and value is dropped.
+_ENV_LINE_RE = re.compile(
+    r"^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.M
+)
+
+
 def _parse_env_file(path: Path) -> dict[str, str]:
-    values: dict[str, str] = {}
-    for line in path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" in line:
-            key, _, value = line.partition("=")
-            values[key.strip()] = value.strip()
-    return values
+    return {m[1]: m[2] for m in _ENV_LINE_RE.finditer(path.read_text())}
 
 
 def load_operations_env() -> dict[str, str]:
@@ -250,35 +448,142 @@ def load_secrets_dev() -> dict[str, str]:
     return secrets
 
 
-def load_secrets_prod() -> dict[str, str]:
-    """Load secrets from Google Cloud Secret Manager."""
+_is_hex_key = re.compile(r"[0-9a-fA-F]{32}").fullmatch
+
+
+def _parse_key(secrets: dict[str, str], name: str) -> bytes:
+    """Decode the 16-byte AES key stored as hex under secrets[name]."""
+    value = secrets[name].strip()
+    # Checked up front: bytes.fromhex() skips embedded whitespace, so a
+    # 32-char value could still decode to fewer than 16 bytes.
+    if not _is_hex_key(value):
+        raise ValueError(f"{name} must be 16 bytes (32 hex)")
+    return bytes.fromhex(value)
+
+
+_PROD_SECRET_NAMES = ("DIVERSIFICATION_MASTER_KEY", "TERMINAL_KEY")
+
+
+def _fetch_gcloud_secret(name: str) -> str:
+    try:
+        result = subprocess.run(
+            ["gcloud", "secrets", "versions", "access", "latest",
+             "--secret", name],
+            capture_output=True, text=True, check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(
+            f"Failed to fetch secret {name} from gcloud: {e.stderr}"
+        ) from e
+    except FileNotFoundError:
+        raise RuntimeError(
+            "gcloud CLI not found. Install Google Cloud SDK."
+        )
+    return result.stdout.strip()
+
+
+def _gcloud_project() -> str | None:
+    """Return the project the gcloud CLI would use, from its config files.
+
+    Reads the files directly rather than running `gcloud config`, which
+    would cost the CLI startup the in-process client is meant to avoid.
+    """
+    project = os.environ.get("CLOUDSDK_CORE_PROJECT")
+    if project:
+        return project
+    config_dir = os.environ.get("CLOUDSDK_CONFIG")
+    if not config_dir:
+        if sys.platform == "win32":
+            config_dir = os.path.join(os.environ.get("APPDATA", ""), "gcloud")
+        else:
+            config_dir = os.path.expanduser("~/.config/gcloud")
+    config_name = os.environ.get("CLOUDSDK_ACTIVE_CONFIG_NAME")
+    if not config_name:
+        try:
+            with open(os.path.join(config_dir, "active_config")) as f:
+                config_name = f.read().strip()
+        except OSError:
+            pass
+    config = configparser.ConfigParser()
+    config.read(os.path.join(
+        config_dir, "configurations", f"config_{config_name or 'default'}"
+    ))
+    return config.get("core", "project", fallback=None) or None
+
+
+def _load_secrets_client() -> dict[str, str] | None:
+    """Fetch the secrets in-process with the Secret Manager client.
+
+    Reads from the gcloud-configured project, the same one the CLI path
+    uses. Returns None when that project is unknown, when
+    google-cloud-secret-manager is not installed, when there are no
+    application default credentials, or when those credentials are
+    refused, so the caller can fall back to the gcloud CLI and its
+    active account.
+    """
+    project = _gcloud_project()
+    if not project:
+        return None
+    # Imported here: the client stack loads grpc, which is too slow to pay
+    # for on every start when only prod mode needs it.
+    try:
+        import google.auth
+        from google.api_core import exceptions as google_api_exceptions
+        from google.cloud import secretmanager
+    except ImportError:
+        return None
+    try:
+        credentials, _ = google.auth.default()
+    except google.auth.exceptions.DefaultCredentialsError as e:
+        _LOG.debug("No application default credentials: %s", e)
+        return None
+    client = secretmanager.SecretManagerServiceClient(credentials=credentials)
     secrets = {}
-    for name in ["DIVERSIFICATION_MASTER_KEY", "TERMINAL_KEY"]:
+    for name in _PROD_SECRET_NAMES:
+        path = client.secret_version_path(project, name, "latest")
         try:
-            result = subprocess.run(
-                ["gcloud", "secrets", "versions", "access", "latest",
-                 "--secret", name],
-                capture_output=True, text=True, check=True,
-            )
-            secrets[name] = result.stdout.strip()
-        except subprocess.CalledProcessError as e:
+            response = client.access_secret_version(request={"name": path})
+        except (
+            google.auth.exceptions.GoogleAuthError,
+            google_api_exceptions.PermissionDenied,
+            google_api_exceptions.Unauthenticated,
+        ) as e:
+            _LOG.debug("Secret Manager refused ADC, using gcloud: %s", e)
+            return None
+        except Exception as e:
             raise RuntimeError(
-                f"Failed to fetch secret {name} from gcloud: {e.stderr}"
+                f"Failed to fetch secret {name} from Secret Manager: {e}"
             ) from e
-        except FileNotFoundError:
-            raise RuntimeError(
-                "gcloud CLI not found. Install Google Cloud SDK."
-            )
-
+        secrets[name] = response.payload.data.decode().strip()
     return secrets
 
 
+def load_secrets_prod() -> dict[str, str]:
+    """Load secrets from Google Cloud Secret Manager.
+
+    Uses the Python client when google-cloud-secret-manager is installed
+    and application default credentials are set up. Otherwise each gcloud
+    invocation pays CLI startup plus a network round trip, so the secrets
+    are fetched concurrently.
+    """
+    secrets = _load_secrets_client()
+    if secrets is not None:
+        return secrets
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(_PROD_SECRET_NAMES)
+    ) as pool:
+        values = pool.map(_fetch_gcloud_secret, _PROD_SECRET_NAMES)
+        return dict(zip(_PROD_SECRET_NAMES, values))
+
+
 class PersonalizeDevice(PwSystemDevice):
     """Device wrapper with personalization RPC helpers."""
 
     def __init__(self, serial_suffix: str | None = None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._serial_suffix = serial_suffix
+        # Reused by echo() so each call only swaps the payload.
+        self._echo_req = maco_service_pb2.EchoMessage()
 
     @property
     def serial_suffix(self) -> str | None:
@@ -286,15 +591,46 @@ class PersonalizeDevice(PwSystemDevice):
 
     def echo(self, data: bytes = b"hello") -> bytes:
         """Echo data back from the device."""
-        response = self.rpcs.maco.MacoService.Echo(data=data)
+        self._echo_req.data = data
+        response = self.rpcs.maco.MacoService.Echo(self._echo_req)
         return response.response.data
 
+    def batch_echo(self, chunks: Iterable[bytes]) -> list[bytes]:
+        """Echo several payloads with all requests in flight at once.
+
+        Sends every request before waiting for the first response, so the
+        HDLC round trips overlap instead of adding up.
+        """
+        echo = self.rpcs.maco.MacoService.Echo
+        calls = [
+            echo.invoke(maco_service_pb2.EchoMessage(data=chunk))
+            for chunk in chunks
+        ]
+        return [call.wait().response.data for call in calls]
+
     def get_device_info(self):
         """Get device information."""
         response = self.rpcs.maco.MacoService.GetDeviceInfo()
         return response.response
 
 
+@functools.lru_cache(maxsize=8)
+def _get_detokenizer(
+    token_databases: tuple[Path | str, ...],
+) -> detokenize.AutoUpdatingDetokenizer:
+    """Return the process-wide detokenizer for a set of token databases.
+
+    AutoUpdatingDetokenizer watches its files for changes itself, so one
+    instance can serve every connection instead of re-parsing the
+    databases each time. Each database is loaded with all domains.
+    """
+    detokenizer = detokenize.AutoUpdatingDetokenizer(
+        *(f"{token_database}#.*" for token_database in token_databases)
+    )
+    detokenizer.show_errors = True
+    return detokenizer
+
+
 def create_connection(
     device: str | None,
     baudrate: int,
@@ -311,50 +647,51 @@ def create_connection(
 
     detokenizer = None
     if token_databases:
-        token_databases_with_domains = []
-        for token_database in token_databases:
-            token_databases_with_domains.append(str(token_database) + "#.*")
-        detokenizer = detokenize.AutoUpdatingDetokenizer(
-            *token_databases_with_domains
-        )
-        detokenizer.show_errors = True
-
-    protos: list[ModuleType | Path] = []
-    if compiled_protos is None:
-        compiled_protos = []
-
-    compiled_protos.append(log_pb2)
-    compiled_protos.append(unit_test_pb2)
-    protos.extend(compiled_protos)
-    protos.append(metric_service_pb2)
-    protos.append(thread_snapshot_service_pb2)
-    protos.append(file_pb2)
-    protos.append(echo_pb2)
-    protos.append(trace_service_pb2)
-    protos.append(device_service_pb2)
+        detokenizer = _get_detokenizer(tuple(token_databases))
+
+    protos: list[ModuleType | Path] = list(compiled_protos or ())
+    protos.extend(_DEFAULT_PROTOS)
 
     reader: stream_readers.SelectableReader
 
     if socket_addr is None:
         device_pattern = f"/dev/particle_*{serial_suffix}" if serial_suffix else device
 
-        def disconnect_handler(serial_client: ReconnectingSerialClient) -> None:
-            _LOG.error("Serial disconnected. Waiting for device to reappear...")
-            while True:
-                if wait_for_device(device_pattern, timeout=1.0):
-                    if "*" in device_pattern:
-                        matches = glob.glob(device_pattern)
-                        actual_device = matches[0] if matches else device
-                    else:
-                        actual_device = device
+        # Held while a reconnect is in progress; the reader and a writer can
+        # both notice the same disconnect.
+        reconnect_lock = threading.Lock()
+
+        def reconnect_loop(serial_client: ReconnectingSerialClient) -> None:
+            try:
+                while True:
+                    actual_device = wait_for_device(device_pattern, timeout=1.0)
+                    if actual_device is None:
+                        continue
+                    _wait_ready(actual_device)
                     try:
-                        time.sleep(0.5)
                         serial_client.connect_to(actual_device)
                         _LOG.info("Successfully reconnected to %s", actual_device)
                         break
                     except Exception as e:
+                        # The node can show up before udev has finished with
+                        # its permissions; retry shortly.
                         _LOG.debug("Reconnect attempt failed: %s", e)
-                time.sleep(1)
+                        time.sleep(0.05)
+            finally:
+                reconnect_lock.release()
+
+        def disconnect_handler(serial_client: ReconnectingSerialClient) -> None:
+            # Called from the RPC reader (or a writer) thread; reconnect in
+            # the background instead of blocking it on the device wait.
+            if not reconnect_lock.acquire(blocking=False):
+                return
+            _LOG.error("Serial disconnected. Waiting for device to reappear...")
+            threading.Thread(
+                target=reconnect_loop,
+                args=(serial_client,),
+                name="serial-reconnect",
+                daemon=True,
+            ).start()
 
         serial_client = ReconnectingSerialClient(
             device=device,
@@ -362,9 +699,11 @@ def create_connection(
             on_disconnect=disconnect_handler,
             serial_debug=serial_debug,
         )
-        reader = stream_readers.SelectableReader(serial_client, 8192)
+        reader = stream_readers.SelectableReader(serial_client, _READ_CHUNK_SIZE)
         write = serial_client.write
     else:
+        from pw_console import socket_client
+
         socket_impl = (
             socket_client.SocketClientWithLogging
             if serial_debug
@@ -386,7 +725,7 @@ def create_connection(
         socket_device = socket_impl(
             socket_addr, on_disconnect=socket_disconnect_handler
         )
-        reader = stream_readers.SelectableReader(socket_device, 8192)
+        reader = stream_readers.SelectableReader(socket_device, _READ_CHUNK_SIZE)
         write = socket_device.write
 
     device_client = PersonalizeDevice(
@@ -411,6 +750,49 @@ PERSONALIZE_PROTOS = [
 ]
 
 
+# Buffered log records are written at least this often, and immediately
+# for ERROR and above.
+_LOG_FLUSH_INTERVAL_S = 0.1
+
+
+def _buffer_file_logging(logfile: str) -> None:
+    """Batch writes to the root logger's file handler for logfile.
+
+    At DEBUG level every pw_rpc call and tag event is logged; writing each
+    record straight through costs a write() per line. Wrap the handler in
+    a MemoryHandler that a background thread flushes periodically.
+    """
+    root = logging.getLogger()
+    path = os.path.abspath(logfile)
+    for handler in root.handlers:
+        if (
+            isinstance(handler, logging.FileHandler)
+            and handler.baseFilename == path
+        ):
+            break
+    else:
+        return
+
+    buffered = logging.handlers.MemoryHandler(
+        capacity=256, flushLevel=logging.ERROR, target=handler
+    )
+    # MemoryHandler hands records to target.handle(), which skips the
+    # target's level check, so apply it here instead.
+    buffered.setLevel(handler.level)
+    root.removeHandler(handler)
+    root.addHandler(buffered)
+    atexit.register(buffered.flush)
+
+    def flush_periodically() -> None:
+        while True:
+            time.sleep(_LOG_FLUSH_INTERVAL_S)
+            buffered.flush()
+
+    threading.Thread(
+        target=flush_periodically, name="log-flush", daemon=True
+    ).start()
+
+
 WELCOME_MSG = """\
 Welcome to the MACO Personalize Console!
 
@@ -427,33 +809,31 @@ REPL examples:
 
 
 def main() -> int:
-    from tools.personalize_pane import PersonalizePane
-
-    serial_suffix = None
-    use_prod = False
-    filtered_argv = [sys.argv[0]]
-    i = 1
-    while i < len(sys.argv):
-        arg = sys.argv[i]
-        if arg == "--device-serial-suffix" and i + 1 < len(sys.argv):
-            serial_suffix = sys.argv[i + 1]
-            i += 2
-        elif arg.startswith("--device-serial-suffix="):
-            serial_suffix = arg.split("=", 1)[1]
-            i += 1
-        elif arg == "--prod":
-            use_prod = True
-            i += 1
-        else:
-            filtered_argv.append(arg)
-            i += 1
-
     parser = argparse.ArgumentParser(
         prog="maco-personalize-console",
         description=__doc__,
     )
     parser = add_device_args(parser)
-    args, _remaining_args = parser.parse_known_args(filtered_argv[1:])
+    parser.add_argument(
+        "--device-serial-suffix",
+        default=None,
+        help="Serial number suffix; reconnects to /dev/particle_*<suffix>",
+    )
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Load secrets from Google Cloud Secret Manager",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=None,
+        help="Base personalize state poll interval in seconds, 0.1-10 "
+        "(default: $MACO_PERSONALIZE_POLL_S or 0.5)",
+    )
+    args, _remaining_args = parser.parse_known_args(sys.argv[1:])
+    serial_suffix = args.device_serial_suffix
+    use_prod = args.prod
 
     # Load operational config (non-secrets) and secrets
     try:
@@ -468,23 +848,29 @@ def main() -> int:
         print(f"Error loading config: {e}")
         return 1
 
-    master_key = bytes.fromhex(secrets["DIVERSIFICATION_MASTER_KEY"])
-    terminal_key = bytes.fromhex(secrets["TERMINAL_KEY"])
+    try:
+        master_key = _parse_key(secrets, "DIVERSIFICATION_MASTER_KEY")
+        terminal_key = _parse_key(secrets, "TERMINAL_KEY")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
     system_name = ops["DIVERSIFICATION_SYSTEM_NAME"]
     sdm_base_url = ops["SDM_BASE_URL"]
 
-    if len(master_key) != 16:
-        print("Error: DIVERSIFICATION_MASTER_KEY must be 16 bytes (32 hex)")
-        return 1
-    if len(terminal_key) != 16:
-        print("Error: TERMINAL_KEY must be 16 bytes (32 hex)")
-        return 1
-
     mode_label = "PROD" if use_prod else "DEV"
     print(f"Secrets loaded ({mode_label}): master_key=...{master_key[-2:].hex()}, "
           f"terminal_key=...{terminal_key[-2:].hex()}, "
           f"system_name={system_name}, sdm_url=https://{sdm_base_url}")
 
+    # pw_console and the pane pull in prompt_toolkit and the whole console
+    # UI; only pay for that once the config is known to be usable.
+    from pw_console import embed as pw_embed
+    from pw_console import python_logging as pw_logging
+    from pw_console.log_store import LogStore
+    from pw_rpc.console_tools.console import flattened_rpc_completions
+
+    from tools.personalize_pane import PersonalizePane
+
     is_serial = args.device is not None
 
     if is_serial and not os.path.exists(args.device):
@@ -493,7 +879,7 @@ def main() -> int:
             print(f"Device {args.device} not found")
             return 1
         print(f"Device {args.device} found")
-        time.sleep(0.5)
+        _wait_ready(args.device)
 
     try:
         if serial_suffix:
@@ -505,7 +891,7 @@ def main() -> int:
             token_databases=args.token_databases or [],
             socket_addr=args.socket_addr,
             serial_debug=args.serial_debug,
-            compiled_protos=list(PERSONALIZE_PROTOS),
+            compiled_protos=PERSONALIZE_PROTOS,
             rpc_logging=args.rpc_logging,
             hdlc_encoding=args.hdlc_encoding,
             channel_id=args.channel_id,
@@ -524,6 +910,7 @@ def main() -> int:
         pw_cli.log.install(
             level=logging.DEBUG, use_color=False, log_file=logfile
         )
+        _buffer_file_logging(logfile)
 
         # Silence the 2/s state-poll pings; real actions still get logged.
         state_poll_filter = _StatePollLogFilter()
@@ -539,6 +926,7 @@ def main() -> int:
                 terminal_key=terminal_key,
                 system_name=system_name,
                 sdm_base_url=sdm_base_url,
+                poll_interval_s=args.poll_interval,
             )
 
             console = pw_embed.PwConsoleEmbed(
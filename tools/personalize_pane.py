@@ -9,10 +9,16 @@ for personalization. Supports manual (press 'p') and auto modes.
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import functools
+import itertools
 import logging
+import os
+import queue
 import threading
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from prompt_toolkit.filters import has_focus
 from prompt_toolkit.formatted_text import FormattedText
@@ -24,6 +30,7 @@ from pw_console.plugin_mixin import PluginMixin
 from pw_console.widgets import ToolbarButton, WindowPane, WindowPaneToolbar
 from pw_console.get_pw_console_app import get_pw_console_app
 
+from maco_pb import personalization_service_pb2
 from tools.ntag_key_diversification import diversify_keys
 
 
@@ -31,6 +38,8 @@ _LOG = logging.getLogger(__name__)
 
 # Maximum log entries to keep in scrolling history
 _MAX_LOG_ENTRIES = 100
+# Most recent log entries shown in the pane
+_MAX_SHOWN_ENTRIES = 20
 
 # Proto enum values for GetPersonalizeStateResponse.State
 _STATE_IDLE = 0
@@ -49,6 +58,35 @@ _STATE_VERIFIED = 10
 _TAG_TYPE_FACTORY = 1
 _TAG_TYPE_MACO = 2
 
+_TAG_TYPE_NAMES = {
+    _TAG_TYPE_FACTORY: "factory",
+    _TAG_TYPE_MACO: "maco",
+}
+
+# Base interval between GetPersonalizeState polls, in seconds. Overridden
+# by the poll_interval_s argument or MACO_PERSONALIZE_POLL_S, and adjusted
+# at runtime with +/-, always within [_MIN_POLL_S, _MAX_POLL_S].
+_DEFAULT_POLL_S = 0.5
+_MIN_POLL_S = 0.1
+_MAX_POLL_S = 10.0
+
+# Poll interval per last seen state, as a multiple of the base interval.
+# Poll fast while a tag is moving through the key exchange, slower once it
+# has settled. Idle still has to notice a newly presented tag promptly.
+_POLL_INTERVAL_SCALE = {
+    _STATE_IDLE: 2.0,
+    _STATE_PROBING: 1.0,
+    _STATE_FACTORY_TAG: 0.4,
+    _STATE_MACO_TAG: 0.4,
+    _STATE_UNKNOWN_TAG: 2.0,
+    _STATE_AWAITING_KEYS: 0.4,
+    _STATE_PERSONALIZING: 0.4,
+    _STATE_PERSONALIZED: 2.0,
+    _STATE_ERROR: 2.0,
+    _STATE_VERIFYING: 0.4,
+    _STATE_VERIFIED: 2.0,
+}
+
 _STATE_NAMES = {
     _STATE_IDLE: "idle",
     _STATE_PROBING: "probing",
@@ -63,8 +101,83 @@ _STATE_NAMES = {
     _STATE_VERIFIED: "verified",
 }
 
+# Writes/verifies that are in progress, and the state each ends in.
+_COMPLETED_STATE = {
+    _STATE_PERSONALIZING: _STATE_PERSONALIZED,
+    _STATE_VERIFYING: _STATE_VERIFIED,
+}
+# Once enough durations of a write/verify are known, poll it at these
+# quantiles of the past durations instead of at a fixed rate, then fall
+# back to the fixed rate if it takes longer than all of them.
+_DURATION_SAMPLES = 200
+_MIN_DURATION_SAMPLES = 20
+_POLL_QUANTILES = (0.25, 0.5, 0.75, 0.9, 1.0)
+
+# Bulk mode polls this much faster, to keep up with a stack of tags.
+_BULK_POLL_SCALE = 0.5
+
+# Personalize requests that may wait behind the one in flight.
+_MAX_QUEUED_PERSONALIZE = 8
+
+# Upper bound on tags with keys derived ahead of time.
+_MAX_PENDING_KEYS = 32
+
+# Log entry status -> indented icon fragment that starts each log line.
+_STATUS_ICON: dict[str, tuple[str, str]] = {
+    "pending": ("", "  [.]"),
+    "personalizing": ("class:theme-fg-cyan", "  [~]"),
+    "verifying": ("class:theme-fg-cyan", "  [~]"),
+    "ok": ("class:theme-fg-green", "  [\u2713]"),
+    "verified": ("class:theme-fg-cyan", "  [\u2713]"),
+    "fail": ("class:theme-fg-red", "  [\u2717]"),
+    "skipped": ("class:theme-fg-dim", "  [-]"),
+}
+_UNKNOWN_STATUS_ICON = ("", "  [?]")
+
+# Fixed fragments for _get_formatted_text.
+_NL = ("", "\n")
+_SP = ("", " ")
+_INDENT = ("", "  ")
+_SLASH = ("", " / ")
+_SEP_LINE = ("class:theme-fg-dim", "  " + "\u2500" * 48)
+_TITLE = ("class:theme-fg-cyan", "  Personalize")
+_MODE_AUTO = ("class:theme-fg-green", "[AUTO]")
+_MODE_MANUAL = ("class:theme-fg-cyan", "[MANUAL]")
+_BULK_STYLE = "class:theme-fg-yellow"
+_CURRENT_LABEL = ("", "  Current: ")
+_NO_HISTORY = ("class:theme-fg-dim", "  No history")
+_HINT_PERSONALIZE = ("class:theme-fg-yellow", "(press p)")
+_HINT_VERIFY = ("class:theme-fg-yellow", "(press p to verify)")
+_BUSY_HINT = {
+    _STATE_PERSONALIZING: ("class:theme-fg-cyan", "(writing...)"),
+    _STATE_VERIFYING: ("class:theme-fg-cyan", "(verifying...)"),
+}
+
+
+def _clamp_poll_interval(seconds: float) -> float:
+    return max(_MIN_POLL_S, min(_MAX_POLL_S, seconds))
 
-@dataclass
+
+def _poll_interval_from_env() -> float:
+    value = os.environ.get("MACO_PERSONALIZE_POLL_S")
+    if not value:
+        return _DEFAULT_POLL_S
+    try:
+        return float(value)
+    except ValueError:
+        _LOG.warning("Ignoring invalid MACO_PERSONALIZE_POLL_S=%r", value)
+        return _DEFAULT_POLL_S
+
+
+@functools.lru_cache(maxsize=256)
+def _diversify_keys_cached(
+    master_key: bytes, system_name: str, uid: bytes
+) -> tuple[tuple[str, bytes], ...]:
+    """diversify_keys, cached so retrying the same tag skips the CMACs."""
+    return tuple(diversify_keys(master_key, system_name, uid).items())
+
+
+@dataclass(slots=True)
 class TagLogEntry:
     """One personalization/verification attempt in the scrolling log."""
     uid_hex: str
@@ -73,7 +186,6 @@ class TagLogEntry:
     # "skipped"
     status: str
     message: str = ""
-    timestamp: float = field(default_factory=time.monotonic)
 
 
 class PersonalizeControl(FormattedTextControl):
@@ -92,10 +204,22 @@ class PersonalizeControl(FormattedTextControl):
         def _toggle_auto(_event: KeyPressEvent) -> None:
             self.pane.toggle_auto_mode()
 
+        @key_bindings.add("b")
+        def _toggle_bulk(_event: KeyPressEvent) -> None:
+            self.pane.toggle_bulk_mode()
+
         @key_bindings.add("r")
         def _reset(_event: KeyPressEvent) -> None:
             self.pane.reset_log()
 
+        @key_bindings.add("+")
+        def _poll_slower(_event: KeyPressEvent) -> None:
+            self.pane.scale_poll_interval(2.0)
+
+        @key_bindings.add("-")
+        def _poll_faster(_event: KeyPressEvent) -> None:
+            self.pane.scale_poll_interval(0.5)
+
         kwargs["key_bindings"] = key_bindings
         super().__init__(*args, **kwargs)
 
@@ -110,8 +234,9 @@ class PersonalizeControl(FormattedTextControl):
 class PersonalizePane(WindowPane, PluginMixin):
     """Tag personalization pane for pw_console.
 
-    Polls GetPersonalizeState every 500ms to detect tags, then sends
-    diversified keys via PersonalizeTag when requested.
+    Polls GetPersonalizeState to detect tags (faster while a tag is being
+    handled, see _POLL_INTERVAL_SCALE), then sends diversified keys via
+    PersonalizeTag when requested.
     """
 
     def __init__(
@@ -121,6 +246,7 @@ class PersonalizePane(WindowPane, PluginMixin):
         terminal_key: bytes = b"",
         system_name: str = "OwwMachineAuth",
         sdm_base_url: str = "",
+        poll_interval_s: float | None = None,
         *args,
         **kwargs,
     ):
@@ -130,14 +256,73 @@ class PersonalizePane(WindowPane, PluginMixin):
         self._terminal_key = terminal_key
         self._system_name = system_name
         self._sdm_base_url = sdm_base_url
+        # Fields that are the same for every tag; each PersonalizeTag call
+        # copies this and fills in the UID and diversified keys.
+        self._personalize_template = (
+            personalization_service_pb2.PersonalizeTagRequest(
+                terminal_key=terminal_key,
+                sdm_base_url=sdm_base_url,
+            )
+        )
 
         self._auto_mode = False
+        # Bulk mode personalizes every factory tag as soon as it awaits
+        # keys and counts how many were done since it was turned on.
+        self._bulk_mode = False
+        self._bulk_done = 0
         self._current_uid: bytes | None = None
         self._current_tag_type: str = ""
         self._current_state: int = _STATE_IDLE
         self._prev_state: int = _STATE_IDLE
-        self._log: list[TagLogEntry] = []
+        self._log: collections.deque[TagLogEntry] = collections.deque(
+            maxlen=_MAX_LOG_ENTRIES
+        )
+        # UID -> position of its latest entry, counted from the first entry
+        # ever logged; _log_base is the position of self._log[0].
+        self._log_index: dict[str, int] = {}
+        self._log_base = 0
+        # Entries in the log per status, kept up to date for the header.
+        self._status_counts: collections.Counter[str] = collections.Counter()
+        # Bumped whenever anything shown in the pane changes; the rendered
+        # text is cached against it.
+        self._render_seq = 0
+        self._render_cache: tuple[int, FormattedText] | None = None
+        # Guards the pane state above. The poll callback, the personalize
+        # worker and the UI thread all touch it, so it is shared state
+        # rather than something replayed on the UI event loop; redraws
+        # are already marshalled there by redraw_ui().
         self._lock = threading.Lock()
+        if poll_interval_s is None:
+            poll_interval_s = _poll_interval_from_env()
+        self._poll_interval_s = _clamp_poll_interval(poll_interval_s)
+        self._durations: dict[int, collections.deque[float]] = {
+            state: collections.deque(maxlen=_DURATION_SAMPLES)
+            for state in _COMPLETED_STATE
+        }
+        # When the write/verify in progress was first seen, and the offsets
+        # from then at which to poll it.
+        self._busy_since: float | None = None
+        self._poll_plan: tuple[float, ...] = ()
+        # Keys are derived in the background as soon as a tag shows up, so
+        # the PersonalizeTag call does not wait for them.
+        self._key_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="diversify"
+        )
+        self._pending_keys: dict[
+            bytes, concurrent.futures.Future[tuple[tuple[str, bytes], ...]]
+        ] = {}
+        # PersonalizeTag calls run one at a time on a single worker; there
+        # is only one reader on the device anyway.
+        self._personalize_queue: queue.Queue[tuple[bytes, str]] = queue.Queue(
+            maxsize=_MAX_QUEUED_PERSONALIZE
+        )
+        threading.Thread(
+            target=self._personalize_worker,
+            daemon=True,
+            name="personalize",
+        ).start()
+        # Set to poll right away instead of waiting out the interval.
+        self._poll_now = threading.Event()
 
         self._control = PersonalizeControl(
             self,
@@ -160,6 +345,9 @@ class PersonalizePane(WindowPane, PluginMixin):
         self.bottom_toolbar.add_button(
             ToolbarButton(key="a", description="Toggle Auto")
         )
+        self.bottom_toolbar.add_button(
+            ToolbarButton(key="b", description="Toggle Bulk")
+        )
         self.bottom_toolbar.add_button(
             ToolbarButton(
                 key="r",
@@ -175,11 +363,17 @@ class PersonalizePane(WindowPane, PluginMixin):
 
         self.plugin_init(
             plugin_callback=self._background_task,
-            plugin_callback_frequency=0.5,
+            # _background_task paces itself; see _POLL_INTERVAL_SCALE.
+            plugin_callback_frequency=0.0,
             plugin_logger_name="personalize_pane",
         )
 
     # ── Actions ───────────────────────────────────────────────────────
+    #
+    # redraw_ui() ends in Application.invalidate(), which is thread-safe and
+    # ignores further calls until the pending repaint has run, so actions,
+    # the poll callback and the personalize thread can all call it directly
+    # without flooding the UI.
 
     def personalize_current(self) -> None:
         """Request personalization for the currently detected tag."""
@@ -188,58 +382,133 @@ class PersonalizePane(WindowPane, PluginMixin):
                 return
             uid = self._current_uid
             uid_hex = uid.hex()
-        threading.Thread(
-            target=self._do_personalize,
-            args=(uid, uid_hex),
-            daemon=True,
-            name="personalize",
-        ).start()
+        self._poll_now.set()
+        self._queue_personalize(uid, uid_hex)
 
     def toggle_auto_mode(self) -> None:
         """Toggle automatic personalization of factory tags."""
         with self._lock:
             self._auto_mode = not self._auto_mode
+            self._render_seq += 1
             mode = "ON" if self._auto_mode else "OFF"
         _LOG.info("Auto mode: %s", mode)
         self.redraw_ui()
 
+    def toggle_bulk_mode(self) -> None:
+        """Toggle bulk personalization of a stack of factory tags."""
+        with self._lock:
+            self._bulk_mode = not self._bulk_mode
+            if self._bulk_mode:
+                self._bulk_done = 0
+            self._render_seq += 1
+            mode = "ON" if self._bulk_mode else "OFF"
+        _LOG.info("Bulk mode: %s", mode)
+        # Switch to the bulk poll rate right away.
+        self._poll_now.set()
+        self.redraw_ui()
+
     def reset_log(self) -> None:
         """Clear the personalization log."""
         with self._lock:
+            self._log_base += len(self._log)
             self._log.clear()
+            self._log_index.clear()
+            self._status_counts.clear()
+            self._render_seq += 1
         self.redraw_ui()
 
+    def scale_poll_interval(self, factor: float) -> None:
+        """Multiply the base poll interval, within [0.1 s, 10 s]."""
+        with self._lock:
+            self._poll_interval_s = _clamp_poll_interval(
+                self._poll_interval_s * factor
+            )
+            interval = self._poll_interval_s
+        _LOG.info("Poll interval: %.2f s", interval)
+        # Apply it now rather than after the current wait.
+        self._poll_now.set()
+
     # ── Polling ───────────────────────────────────────────────────────
 
     def _background_task(self) -> bool:
-        """PluginMixin callback: poll device state."""
+        """PluginMixin callback: wait for the next poll, then poll state.
+
+        Waits before polling so the redraw triggered by returning True
+        shows the fresh state. Only asks for a redraw if something shown
+        changed since the previous poll.
+        """
+        with self._lock:
+            interval = self._next_poll_delay()
+            seq = self._render_seq
+        self._poll_now.wait(interval)
+        self._poll_now.clear()
         try:
             self._poll_state()
         except Exception as e:
             _LOG.error("Poll error: %s", e)
-        return True
+        with self._lock:
+            return self._render_seq != seq
+
+    def _next_poll_delay(self) -> float:
+        """Seconds until the next poll. Called with _lock held."""
+        if self._poll_plan and self._busy_since is not None:
+            elapsed = time.monotonic() - self._busy_since
+            for offset in self._poll_plan:
+                if offset > elapsed:
+                    return max(offset - elapsed, _MIN_POLL_S)
+        interval = self._poll_interval_s * _POLL_INTERVAL_SCALE.get(
+            self._current_state, 1.0
+        )
+        if self._bulk_mode:
+            interval *= _BULK_POLL_SCALE
+        return interval
+
+    def _plan_polls(self, prev: int, state: int) -> None:
+        """Record how long the last write/verify took and plan the next.
+
+        Called with _lock held.
+        """
+        now = time.monotonic()
+        if (self._busy_since is not None
+                and _COMPLETED_STATE.get(prev) == state):
+            self._durations[prev].append(now - self._busy_since)
+        self._busy_since = None
+        self._poll_plan = ()
+        if state in _COMPLETED_STATE:
+            self._busy_since = now
+            samples = sorted(self._durations[state])
+            if len(samples) >= _MIN_DURATION_SAMPLES:
+                last = len(samples) - 1
+                self._poll_plan = tuple(sorted(
+                    {samples[int(q * last)] for q in _POLL_QUANTILES}
+                ))
+
+    @functools.cached_property
+    def _personalize_service(self):
+        return self._device.rpcs.maco.PersonalizationService
 
     def _poll_state(self) -> None:
         """Call GetPersonalizeState and update pane."""
-        personalize_svc = (
-            self._device.rpcs.maco.PersonalizationService
-        )
-        status, resp = personalize_svc.GetPersonalizeState()
+        status, resp = self._personalize_service.GetPersonalizeState()
         if not status.ok():
             return
 
         state = resp.state
-        uid = bytes(resp.uid) if resp.uid else b""
-        uid_hex = uid.hex() if uid else ""
+        # Most polls see the same state again, which changes nothing. Only
+        # this thread writes _prev_state, so it can be read without the lock.
+        if state == self._prev_state:
+            return
+
+        # A protobuf bytes field is already immutable bytes, so this does not
+        # copy; an unset UID gives b"" and "".
+        uid = bytes(resp.uid)
+        uid_hex = uid.hex()
         error_msg = resp.error_message
 
         # The response carries the identified tag type directly — polling
         # usually misses the short-lived FACTORY_TAG/MACO_TAG states, so
         # deriving the type from `state` would mislabel most tags.
-        tag_type_str = {
-            _TAG_TYPE_FACTORY: "factory",
-            _TAG_TYPE_MACO: "maco",
-        }.get(resp.tag_type, "")
+        tag_type_str = _TAG_TYPE_NAMES.get(resp.tag_type, "")
         if not tag_type_str and state == _STATE_UNKNOWN_TAG:
             tag_type_str = "unknown"
 
@@ -247,12 +516,17 @@ class PersonalizePane(WindowPane, PluginMixin):
             prev = self._prev_state
             self._current_state = state
             self._prev_state = state
+            auto_personalize = self._handle_transition(
+                prev, state, uid, uid_hex, tag_type_str, error_msg
+            )
 
-            # Detect state transitions
-            if state != prev:
-                self._handle_transition(
-                    prev, state, uid, uid_hex, tag_type_str, error_msg
-                )
+        # Logging and queueing work don't need the lock that the UI waits on.
+        _LOG.info(
+            "State: %s -> %s uid=%s",
+            _STATE_NAMES.get(prev), _STATE_NAMES.get(state, "?"), uid_hex,
+        )
+        if auto_personalize:
+            self._queue_personalize(uid, uid_hex)
 
     def _handle_transition(
         self,
@@ -262,15 +536,20 @@ class PersonalizePane(WindowPane, PluginMixin):
         uid_hex: str,
         tag_type_str: str,
         error_msg: str,
-    ) -> None:
-        """Handle state transitions. Called with _lock held."""
-        state_name = _STATE_NAMES.get(state, "?")
-        _LOG.info("State: %s -> %s uid=%s", _STATE_NAMES.get(prev), state_name, uid_hex)
+    ) -> bool:
+        """Update pane state for a transition. Called with _lock held.
+
+        Returns whether the tag should be personalized automatically; the
+        caller queues that after releasing the lock.
+        """
+        self._plan_polls(prev, state)
+        self._render_seq += 1
 
         if state in (_STATE_FACTORY_TAG, _STATE_MACO_TAG,
                      _STATE_AWAITING_KEYS):
             self._current_uid = uid
             self._current_tag_type = tag_type_str or "factory"
+            self._prefetch_keys(uid)
 
             # Only add log entry on first detection (not awaiting_keys)
             if prev in (_STATE_IDLE, _STATE_PROBING):
@@ -279,30 +558,25 @@ class PersonalizePane(WindowPane, PluginMixin):
                     tag_type=self._current_tag_type,
                     status="pending",
                 )
-                self._log.append(entry)
-                self._trim_log()
+                self._append_entry(entry)
 
             # Auto-personalize factory tags / auto-verify MaCo tags. Both
             # paths just deliver the diversified keys; the firmware decides
-            # (factory -> personalize, maco -> verify).
-            if (state == _STATE_AWAITING_KEYS
-                    and self._auto_mode
-                    and self._current_tag_type in ("factory", "maco")):
-                uid_copy = uid
-                uid_hex_copy = uid_hex
-                # Release lock before RPC
-                threading.Thread(
-                    target=self._do_personalize,
-                    args=(uid_copy, uid_hex_copy),
-                    daemon=True,
-                    name="personalize",
-                ).start()
+            # (factory -> personalize, maco -> verify). Bulk mode only
+            # handles factory tags.
+            if state != _STATE_AWAITING_KEYS:
+                return False
+            if self._auto_mode:
+                return self._current_tag_type in ("factory", "maco")
+            return self._bulk_mode and self._current_tag_type == "factory"
 
         elif state == _STATE_PERSONALIZING:
             self._update_last_entry(uid_hex, "personalizing", "")
 
         elif state == _STATE_PERSONALIZED:
             self._update_last_entry(uid_hex, "ok", "")
+            if self._bulk_mode:
+                self._bulk_done += 1
             self._current_uid = uid
             self._current_tag_type = "maco"
 
@@ -320,6 +594,30 @@ class PersonalizePane(WindowPane, PluginMixin):
         elif state == _STATE_IDLE:
             self._current_uid = None
             self._current_tag_type = ""
+            self._pending_keys.clear()
+
+        return False
+
+    def _prefetch_keys(self, uid: bytes) -> None:
+        """Start deriving the keys for uid. Called with _lock held."""
+        if not uid or uid in self._pending_keys:
+            return
+        if len(self._pending_keys) >= _MAX_PENDING_KEYS:
+            self._pending_keys.clear()
+        self._pending_keys[uid] = self._key_executor.submit(
+            _diversify_keys_cached, self._master_key, self._system_name, uid
+        )
+
+    def _queue_personalize(self, uid: bytes, uid_hex: str) -> None:
+        try:
+            self._personalize_queue.put_nowait((uid, uid_hex))
+        except queue.Full:
+            _LOG.warning("Personalize queue full, dropping %s", uid_hex)
+
+    def _personalize_worker(self) -> None:
+        while True:
+            uid, uid_hex = self._personalize_queue.get()
+            self._do_personalize(uid, uid_hex)
 
     def _do_personalize(self, uid: bytes, uid_hex: str) -> None:
         """Diversify keys and send PersonalizeTag RPC."""
@@ -329,24 +627,30 @@ class PersonalizePane(WindowPane, PluginMixin):
                 else "personalizing"
             )
             self._update_last_entry(uid_hex, status, "")
+            pending = self._pending_keys.get(uid)
 
         self.redraw_ui()
 
         try:
-            keys = diversify_keys(self._master_key, self._system_name, uid)
-
-            personalize_svc = (
-                self._device.rpcs.maco.PersonalizationService
-            )
-            status, resp = personalize_svc.PersonalizeTag(
-                uid=uid,
-                application_key=keys["application"],
-                terminal_key=self._terminal_key,
-                authorization_key=keys["authorization"],
-                sdm_mac_key=keys["sdm_mac"],
-                reserved2_key=keys["reserved2"],
-                sdm_base_url=self._sdm_base_url,
-            )
+            if pending is not None:
+                keys = dict(pending.result())
+            else:
+                keys = dict(_diversify_keys_cached(
+                    self._master_key, self._system_name, uid
+                ))
+
+            # Copied per call so the template only ever holds the shared
+            # fields.
+            request = personalization_service_pb2.PersonalizeTagRequest()
+            request.CopyFrom(self._personalize_template)
+            request.uid = uid
+            request.application_key = keys["application"]
+            request.authorization_key = keys["authorization"]
+            request.sdm_mac_key = keys["sdm_mac"]
+            request.reserved2_key = keys["reserved2"]
+            status, resp = self._personalize_service.PersonalizeTag(request)
+            # The device has moved on; pick up its new state right away.
+            self._poll_now.set()
 
             if not status.ok():
                 with self._lock:
@@ -362,135 +666,143 @@ class PersonalizePane(WindowPane, PluginMixin):
         self, uid_hex: str, status: str, message: str
     ) -> None:
         """Update the most recent log entry matching this UID."""
-        for entry in reversed(self._log):
-            if entry.uid_hex == uid_hex:
-                entry.status = status
-                entry.message = message
-                return
-
-    def _trim_log(self) -> None:
-        """Keep log size bounded."""
-        while len(self._log) > _MAX_LOG_ENTRIES:
-            self._log.pop(0)
+        position = self._log_index.get(uid_hex)
+        if position is None:
+            return
+        entry = self._log[position - self._log_base]
+        self._status_counts[entry.status] -= 1
+        self._status_counts[status] += 1
+        entry.status = status
+        entry.message = message
+        self._render_seq += 1
+
+    def _append_entry(self, entry: TagLogEntry) -> None:
+        """Add a log entry; the deque drops the oldest one when full."""
+        position = self._log_base + len(self._log)
+        if len(self._log) == _MAX_LOG_ENTRIES:
+            evicted = self._log[0]
+            if self._log_index.get(evicted.uid_hex) == self._log_base:
+                del self._log_index[evicted.uid_hex]
+            self._status_counts[evicted.status] -= 1
+            self._log_base += 1
+        self._log_index[entry.uid_hex] = position
+        self._status_counts[entry.status] += 1
+        self._log.append(entry)
 
     # ── Rendering ─────────────────────────────────────────────────────
 
     def _get_formatted_text(self) -> FormattedText:
         fragments: list[tuple[str, str]] = []
-        nl = ("", "\n")
 
         with self._lock:
+            # prompt_toolkit asks on every repaint, mostly with nothing new.
+            cache = self._render_cache
+            if cache is not None and cache[0] == self._render_seq:
+                return cache[1]
+            seq = self._render_seq
             auto_mode = self._auto_mode
+            bulk_mode = self._bulk_mode
+            bulk_done = self._bulk_done
+            keys_pending = len(self._pending_keys)
             current_uid = self._current_uid
             current_tag_type = self._current_tag_type
             current_state = self._current_state
-            log_copy = list(self._log)
-
-        ok_count = sum(1 for e in log_copy if e.status == "ok")
-        verified_count = sum(1 for e in log_copy if e.status == "verified")
-        fail_count = sum(1 for e in log_copy if e.status == "fail")
+            # Copy only the entries shown, most recent first; the header
+            # counts come from _status_counts, not from the log.
+            recent = list(
+                itertools.islice(reversed(self._log), _MAX_SHOWN_ENTRIES)
+            )
+            ok_count = self._status_counts["ok"]
+            verified_count = self._status_counts["verified"]
+            fail_count = self._status_counts["fail"]
 
         # Header
-        mode_str = "AUTO" if auto_mode else "MANUAL"
-        mode_style = "class:theme-fg-green" if auto_mode else "class:theme-fg-cyan"
-        fragments.append(("class:theme-fg-cyan", "  Personalize"))
-        fragments.append(("", "  "))
-        fragments.append((mode_style, f"[{mode_str}]"))
+        fragments.append(_TITLE)
+        fragments.append(_INDENT)
+        fragments.append(_MODE_AUTO if auto_mode else _MODE_MANUAL)
+        if bulk_mode:
+            fragments.append(_SP)
+            fragments.append((
+                _BULK_STYLE,
+                f"[BULK {bulk_done} done, {keys_pending} pre-derived]",
+            ))
         if ok_count or verified_count or fail_count:
-            fragments.append(("", "  "))
+            fragments.append(_INDENT)
             fragments.append(("class:theme-fg-green", f"{ok_count} ok"))
             if verified_count:
-                fragments.append(("", " / "))
+                fragments.append(_SLASH)
                 fragments.append(
                     ("class:theme-fg-cyan", f"{verified_count} verified")
                 )
             if fail_count:
-                fragments.append(("", " / "))
+                fragments.append(_SLASH)
                 fragments.append(("class:theme-fg-red", f"{fail_count} fail"))
-        fragments.append(nl)
-        fragments.append(("class:theme-fg-dim", "  " + "\u2500" * 48))
-        fragments.append(nl)
+        fragments.append(_NL)
+        fragments.append(_SEP_LINE)
+        fragments.append(_NL)
 
         # Current tag
-        state_name = _STATE_NAMES.get(current_state, "?")
         if current_uid:
-            uid_hex = current_uid.hex()
-            fragments.append(("", "  Current: "))
+            fragments.append(_CURRENT_LABEL)
             type_style = (
                 "class:theme-fg-yellow" if current_tag_type == "factory"
                 else "class:theme-fg-cyan"
             )
             fragments.append((type_style, f"[{current_tag_type}]"))
-            fragments.append(("", " "))
-            fragments.append(("bold", uid_hex))
+            fragments.append(_SP)
+            fragments.append(("bold", current_uid.hex()))
             if current_state == _STATE_AWAITING_KEYS:
-                fragments.append(("", " "))
-                hint = (
-                    "(press p to verify)" if current_tag_type == "maco"
-                    else "(press p)"
+                fragments.append(_SP)
+                fragments.append(
+                    _HINT_VERIFY if current_tag_type == "maco"
+                    else _HINT_PERSONALIZE
                 )
-                fragments.append(("class:theme-fg-yellow", hint))
-            elif current_state == _STATE_PERSONALIZING:
-                fragments.append(("", " "))
-                fragments.append(("class:theme-fg-cyan", "(writing...)"))
-            elif current_state == _STATE_VERIFYING:
-                fragments.append(("", " "))
-                fragments.append(("class:theme-fg-cyan", "(verifying...)"))
-            fragments.append(nl)
+            elif current_state in _BUSY_HINT:
+                fragments.append(_SP)
+                fragments.append(_BUSY_HINT[current_state])
+            fragments.append(_NL)
         else:
+            state_name = _STATE_NAMES.get(current_state, "?")
             fragments.append(("class:theme-fg-dim", f"  {state_name}"))
-            fragments.append(nl)
+            fragments.append(_NL)
 
-        fragments.append(("class:theme-fg-dim", "  " + "\u2500" * 48))
-        fragments.append(nl)
+        fragments.append(_SEP_LINE)
+        fragments.append(_NL)
 
         # Log entries (most recent first)
-        if not log_copy:
-            fragments.append(("class:theme-fg-dim", "  No history"))
-            fragments.append(nl)
+        if not recent:
+            fragments.append(_NO_HISTORY)
+            fragments.append(_NL)
         else:
-            for entry in reversed(log_copy[-20:]):
-                icon, icon_style = self._status_icon(entry.status)
-                fragments.append(("", "  "))
-                fragments.append((icon_style, f"[{icon}]"))
-                fragments.append(("", " "))
-                fragments.append(("", entry.uid_hex))
-                fragments.append(("", " "))
+            # Adjacent pieces are merged into as few fragments as the
+            # styles allow.
+            for entry in recent:
+                fragments.append(
+                    _STATUS_ICON.get(entry.status, _UNKNOWN_STATUS_ICON)
+                )
+                fragments.append(("", f" {entry.uid_hex} "))
                 fragments.append(("class:theme-fg-dim", f"({entry.tag_type})"))
                 if entry.message:
-                    fragments.append(("", " "))
                     msg_style = (
                         "class:theme-fg-red" if entry.status == "fail"
                         else "class:theme-fg-dim"
                     )
-                    fragments.append((msg_style, entry.message))
-                fragments.append(nl)
-
-        return FormattedText(fragments)
-
-    @staticmethod
-    def _status_icon(status: str) -> tuple[str, str]:
-        match status:
-            case "pending":
-                return ".", ""
-            case "personalizing" | "verifying":
-                return "~", "class:theme-fg-cyan"
-            case "ok":
-                return "\u2713", "class:theme-fg-green"
-            case "verified":
-                return "\u2713", "class:theme-fg-cyan"
-            case "fail":
-                return "\u2717", "class:theme-fg-red"
-            case "skipped":
-                return "-", "class:theme-fg-dim"
-            case _:
-                return "?", ""
+                    fragments.append((msg_style, f" {entry.message}"))
+                fragments.append(_NL)
+
+        text = FormattedText(fragments)
+        with self._lock:
+            self._render_cache = (seq, text)
+        return text
 
     def get_all_key_bindings(self) -> list:
         return [
             {
                 "Personalize current tag": ["p"],
                 "Toggle auto mode": ["a"],
+                "Toggle bulk mode": ["b"],
                 "Reset log": ["r"],
+                "Poll less often": ["+"],
+                "Poll more often": ["-"],
             }
         ]